@@ -0,0 +1,68 @@
+import uuid
+
+from django.conf import settings
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from reviews.models import User
+from .cache import get_cache
+
+USER_KEY = 'api-user:{}:{}'
+USER_STAMP_KEY = 'api-user-stamp:{}'
+TOKEN_VERSION_KEY = 'api-user-token-version:{}'
+
+
+def get_user_stamp(user_id):
+    cache = get_cache()
+    key = USER_STAMP_KEY.format(user_id)
+    stamp = cache.get(key)
+    if stamp is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        stamp = cache.get(key)
+    return stamp
+
+
+def get_token_version(user_id):
+    cache = get_cache()
+    key = TOKEN_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(
+            pk=user_id, is_active=True
+        ).values_list('token_version', flat=True).first()
+        version = -1 if version is None else version
+        cache.set(key, version, getattr(settings, 'USER_CACHE_TIMEOUT', 60))
+    return version
+
+
+def invalidate_user(user_id):
+    cache = get_cache()
+    cache.set(USER_STAMP_KEY.format(user_id), uuid.uuid4().hex, None)
+    cache.delete(TOKEN_VERSION_KEY.format(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        if 'ver' in validated_token:
+            return self.get_claims_user(user_id, validated_token)
+        cache = get_cache()
+        key = USER_KEY.format(user_id, get_user_stamp(user_id))
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, getattr(settings, 'USER_CACHE_TIMEOUT', 60))
+        return user
+
+    def get_claims_user(self, user_id, validated_token):
+        if get_token_version(user_id) != validated_token['ver']:
+            raise AuthenticationFailed('Токен отозван', code='token_revoked')
+        user = User(id=user_id, username=validated_token.get('username', ''),
+                    role=validated_token.get('role'),
+                    is_staff=validated_token.get('is_staff', False))
+        user.from_token_claims = True
+        return user
@@ -0,0 +1,366 @@
+import json
+import math
+import os
+import threading
+import time
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.dataset import DatasetGenerator, DatasetImporter
+from reviews.models import (Category, Comment, Genre, OutgoingMail, Review,
+                            Roles, Title, User)
+from .tokens import RoleAccessToken
+
+API_PREFIX = '/api/v1'
+READ_METHODS = ('GET', 'HEAD')
+COLD_PARAM = 'benchmark'
+
+CREATED_MODELS = {
+    'titles.create': Title,
+    'reviews.create': Review,
+    'comments.create': Comment,
+}
+
+Endpoint = namedtuple('Endpoint', 'name method path data user status')
+Regression = namedtuple('Regression', 'name metric previous current')
+
+
+def access_token(user):
+    if settings.JWT_ROLE_CLAIMS:
+        return RoleAccessToken.for_user(user)
+    return AccessToken.for_user(user)
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def seed_dataset(**sizes):
+    return list(DatasetImporter(DatasetGenerator(**sizes)).run())
+
+
+@contextmanager
+def throttling_disabled():
+    rates = SimpleRateThrottle.THROTTLE_RATES
+    SimpleRateThrottle.THROTTLE_RATES = dict.fromkeys(rates)
+    try:
+        yield
+    finally:
+        SimpleRateThrottle.THROTTLE_RATES = rates
+
+
+class ApiBenchmark:
+
+    def __init__(self, requests=100, concurrency=4, run_id=None):
+        self.requests = requests
+        self.concurrency = concurrency
+        self.run_id = run_id or time.time_ns()
+        self.local = threading.local()
+        self.created = defaultdict(dict)
+        self.fixtures = []
+
+    def prepare(self):
+        admin, _ = User.objects.get_or_create(
+            username='benchmark-admin',
+            defaults={'email': 'benchmark-admin@yamdb.fake',
+                      'role': Roles.get_admin()})
+        title = Title.objects.order_by('-rating_count', 'id').first()
+        if title is None:
+            raise ValueError('Для замеров нужен хотя бы один отзыв')
+        review = title.reviews.order_by('id').first()
+        if review is None:
+            raise ValueError('Для замеров нужен хотя бы один отзыв')
+        comment = Comment.objects.filter(review=review).order_by('id').first()
+        if comment is None:
+            comment = Comment.objects.create(
+                review=review, author=admin, text='Комментарий')
+            self.fixtures.append(comment)
+        edited_title = Title.objects.create(
+            name=f'Замер {self.run_id}', year=2000, category=title.category)
+        edited_review = Review.objects.create(
+            title=edited_title, author=review.author, text='Замер', score=5)
+        member = User.objects.create(
+            username=f'bench{self.run_id}m',
+            email=f'bench{self.run_id}m@yamdb.fake')
+        self.fixtures += [edited_title, edited_review, member]
+        genre = title.genre.order_by('id').first()
+        self.context = {
+            'title': title.id,
+            'review': review.id,
+            'edited_title': edited_title.id,
+            'edited_review': edited_review.id,
+            'comment': comment.id,
+            'category': title.category.slug if title.category else '',
+            'genre': genre.slug if genre else '',
+            'word': title.name.split()[0],
+            'username': review.author.username,
+        }
+        self.tokens = {
+            'admin': str(access_token(admin)),
+            'author': str(access_token(review.author)),
+            'member': str(access_token(member)),
+        }
+
+    def endpoints(self):
+        context = self.context
+        run = self.run_id
+        title = f'{API_PREFIX}/titles/{context["title"]}'
+        edited_title = f'{API_PREFIX}/titles/{context["edited_title"]}'
+        reviews = f'{title}/reviews'
+        comments = f'{reviews}/{context["review"]}/comments'
+        created = self.created
+        new_title = (lambda i: f'{API_PREFIX}/titles/'
+                     f'{created["titles.create"].get(i)}')
+        new_review = (lambda i: f'{new_title(i)}/reviews/'
+                      f'{created["reviews.create"].get(i)}')
+        endpoints = []
+        for resource, slug in (('categories', context['category']),
+                               ('genres', context['genre'])):
+            url = f'{API_PREFIX}/{resource}'
+            endpoints += [
+                Endpoint(f'{resource}.list', 'GET', f'{url}/', None,
+                         None, 200),
+                Endpoint(f'{resource}.search', 'GET',
+                         f'{url}/?search={slug[:3]}&search_mode=prefix',
+                         None, None, 200),
+                Endpoint(f'{resource}.stats_list', 'GET', f'{url}/stats/',
+                         None, None, 200),
+                Endpoint(f'{resource}.stats', 'GET', f'{url}/{slug}/stats/',
+                         None, None, 200),
+                Endpoint(f'{resource}.create', 'POST', f'{url}/',
+                         lambda i: {'name': f'Замер {i}',
+                                    'slug': f'bench-{run}-{i}'},
+                         'admin', 201),
+                Endpoint(f'{resource}.destroy', 'DELETE',
+                         lambda i, url=url: f'{url}/bench-{run}-{i}/',
+                         None, 'admin', 204),
+            ]
+        endpoints += [
+            Endpoint('titles.list', 'GET', f'{API_PREFIX}/titles/', None,
+                     None, 200),
+            Endpoint('titles.search', 'GET',
+                     f'{API_PREFIX}/titles/?search={context["word"]}', None,
+                     None, 200),
+            Endpoint('titles.filter', 'GET',
+                     f'{API_PREFIX}/titles/?genre={context["genre"]}'
+                     f'&category={context["category"]}', None, None, 200),
+            Endpoint('titles.retrieve', 'GET', f'{title}/', None, None, 200),
+            Endpoint('titles.top', 'GET', f'{API_PREFIX}/titles/top/', None,
+                     None, 200),
+            Endpoint('titles.trending', 'GET',
+                     f'{API_PREFIX}/titles/trending/', None, None, 200),
+            Endpoint('titles.create', 'POST', f'{API_PREFIX}/titles/',
+                     lambda i: {'name': f'Замер {run} {i}', 'year': 2000,
+                                'genre': [context['genre']],
+                                'category': context['category']},
+                     'admin', 201),
+            Endpoint('titles.partial_update', 'PATCH', f'{edited_title}/',
+                     lambda i: {'description': f'Замер {i}'}, 'admin', 200),
+            Endpoint('titles.bulk_update', 'PATCH',
+                     f'{API_PREFIX}/titles/bulk/',
+                     lambda i: [{'id': context['edited_title'],
+                                 'description': f'Пакет {i}'}],
+                     'admin', 200),
+            Endpoint('reviews.list', 'GET', f'{reviews}/', None, None, 200),
+            Endpoint('reviews.list_cursor', 'GET',
+                     f'{reviews}/?pagination=cursor', None, None, 200),
+            Endpoint('reviews.retrieve', 'GET',
+                     f'{reviews}/{context["review"]}/', None, None, 200),
+            Endpoint('reviews.partial_update', 'PATCH',
+                     f'{edited_title}/reviews/{context["edited_review"]}/',
+                     lambda i: {'text': f'Замер {i}'}, 'author', 200),
+            Endpoint('reviews.create', 'POST',
+                     lambda i: f'{new_title(i)}/reviews/',
+                     lambda i: {'text': f'Замер {i}', 'score': 5},
+                     'author', 201),
+            Endpoint('reviews.destroy', 'DELETE',
+                     lambda i: f'{new_review(i)}/', None, 'author', 204),
+            Endpoint('comments.list', 'GET', f'{comments}/', None, None,
+                     200),
+            Endpoint('comments.retrieve', 'GET',
+                     f'{comments}/{context["comment"]}/', None, None, 200),
+            Endpoint('comments.create', 'POST', f'{comments}/',
+                     lambda i: {'text': f'Замер {i}'}, 'author', 201),
+            Endpoint('comments.destroy', 'DELETE',
+                     lambda i: f'{comments}/'
+                     f'{created["comments.create"].get(i)}/',
+                     None, 'author', 204),
+            Endpoint('titles.destroy', 'DELETE', lambda i: f'{new_title(i)}/',
+                     None, 'admin', 204),
+            Endpoint('users.list', 'GET', f'{API_PREFIX}/users/', None,
+                     'admin', 200),
+            Endpoint('users.retrieve', 'GET',
+                     f'{API_PREFIX}/users/{context["username"]}/', None,
+                     'admin', 200),
+            Endpoint('users.me', 'GET', f'{API_PREFIX}/users/me/', None,
+                     'author', 200),
+            Endpoint('users.me_update', 'PATCH', f'{API_PREFIX}/users/me/',
+                     lambda i: {'bio': f'Замер {i}'}, 'member', 200),
+            Endpoint('auth.signup', 'POST', f'{API_PREFIX}/auth/signup/',
+                     lambda i: {'username': f'bench{run}x{i}',
+                                'email': f'bench{run}x{i}@yamdb.fake'},
+                     None, 200),
+            Endpoint('users.destroy', 'DELETE',
+                     lambda i: f'{API_PREFIX}/users/bench{run}x{i}/', None,
+                     'admin', 204),
+            Endpoint('auth.token', 'POST', f'{API_PREFIX}/auth/token/',
+                     lambda i: {'username': context['username'],
+                                'confirmation_code': 'invalid'},
+                     None, 400),
+            Endpoint('profiling.queries', 'GET',
+                     f'{API_PREFIX}/profiling/queries/', None, 'admin', 200),
+        ]
+        return endpoints
+
+    def client(self):
+        if not hasattr(self.local, 'client'):
+            self.local.client = Client()
+        return self.local.client
+
+    def path(self, endpoint, index):
+        if callable(endpoint.path):
+            return endpoint.path(index)
+        return endpoint.path
+
+    def request(self, endpoint, index, cold=False):
+        path = self.path(endpoint, index)
+        if cold and endpoint.method in READ_METHODS:
+            separator = '&' if '?' in path else '?'
+            path = f'{path}{separator}{COLD_PARAM}={self.run_id}'
+        data = endpoint.data(index) if callable(endpoint.data) else None
+        extra = {}
+        if endpoint.user:
+            extra['HTTP_AUTHORIZATION'] = \
+                f'Bearer {self.tokens[endpoint.user]}'
+        if data is not None:
+            extra.update(data=json.dumps(data),
+                         content_type='application/json')
+        start = time.perf_counter()
+        response = getattr(self.client(), endpoint.method.lower())(
+            path, **extra)
+        duration = time.perf_counter() - start
+        if endpoint.name in CREATED_MODELS and response.status_code == 201:
+            self.created[endpoint.name][index] = response.json()['id']
+        return duration, response.status_code
+
+    def worker(self, endpoint, indexes):
+        try:
+            return [self.request(endpoint, index) for index in indexes]
+        finally:
+            connections.close_all()
+
+    def measure(self, endpoint):
+        with CaptureQueriesContext(connection) as queries:
+            _, status = self.request(endpoint, self.requests, cold=True)
+        query_count = len(queries)
+        workers = self.concurrency if endpoint.method in READ_METHODS else 1
+        start = time.perf_counter()
+        if workers == 1:
+            results = [self.request(endpoint, index)
+                       for index in range(self.requests)]
+        else:
+            with ThreadPoolExecutor(workers) as executor:
+                results = [
+                    result for chunk in executor.map(
+                        self.worker, [endpoint] * workers,
+                        [range(number, self.requests, workers)
+                         for number in range(workers)])
+                    for result in chunk]
+        elapsed = time.perf_counter() - start
+        latencies = [duration * 1000 for duration, _ in results]
+        errors = sum(status != endpoint.status for _, status in results)
+        return {
+            'method': endpoint.method,
+            'path': self.path(endpoint, 0),
+            'concurrency': workers,
+            'requests': len(results),
+            'p50': round(percentile(latencies, 50), 3),
+            'p95': round(percentile(latencies, 95), 3),
+            'p99': round(percentile(latencies, 99), 3),
+            'rps': round(len(results) / elapsed, 1) if elapsed else 0,
+            'queries': query_count,
+            'errors': errors + (status != endpoint.status),
+        }
+
+    def cleanup(self):
+        for name, model in CREATED_MODELS.items():
+            model.objects.filter(pk__in=self.created[name].values()).delete()
+        for fixture in reversed(self.fixtures):
+            fixture.delete()
+        prefix = f'bench{self.run_id}x'
+        User.objects.filter(username__startswith=prefix).delete()
+        OutgoingMail.objects.filter(recipient__startswith=prefix).delete()
+        for model in (Category, Genre):
+            model.objects.filter(slug__startswith=f'bench-{self.run_id}-'
+                                 ).delete()
+
+    def run(self, names=None):
+        endpoints = {}
+        try:
+            self.prepare()
+            with throttling_disabled():
+                for endpoint in self.endpoints():
+                    if names and endpoint.name not in names:
+                        continue
+                    endpoints[endpoint.name] = self.measure(endpoint)
+        finally:
+            self.cleanup()
+        return {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'vendor': connection.vendor,
+            'requests': self.requests,
+            'concurrency': self.concurrency,
+            'dataset': {
+                'titles': Title.objects.count(),
+                'reviews': Review.objects.count(),
+                'users': User.objects.count(),
+            },
+            'endpoints': endpoints,
+        }
+
+
+def load_baseline(path):
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_baseline(path, report):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+def find_regressions(previous, current, tolerance=0.2):
+    regressions = []
+    for name, result in current['endpoints'].items():
+        old = previous.get('endpoints', {}).get(name)
+        if old is None:
+            continue
+        for metric in ('p50', 'p95', 'p99'):
+            if result[metric] > old[metric] * (1 + tolerance):
+                regressions.append(
+                    Regression(name, metric, old[metric], result[metric]))
+        if result['rps'] < old['rps'] * (1 - tolerance):
+            regressions.append(
+                Regression(name, 'rps', old['rps'], result['rps']))
+        for metric in ('queries', 'errors'):
+            if result[metric] > old[metric]:
+                regressions.append(
+                    Regression(name, metric, old[metric], result[metric]))
+    return regressions
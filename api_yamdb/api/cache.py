@@ -0,0 +1,52 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+GENERATION_KEY = 'api-generation:{}'
+RESPONSE_KEY = 'api-response:{}'
+
+
+def get_cache_settings():
+    return getattr(settings, 'API_CACHE', {})
+
+
+def get_cache():
+    return caches[get_cache_settings().get('ALIAS', 'default')]
+
+
+def is_process_local(cache):
+    return isinstance(cache, LocMemCache)
+
+
+def get_response_timeout():
+    cache_settings = get_cache_settings()
+    if is_process_local(get_cache()):
+        return cache_settings.get('LOCAL_TIMEOUT', 5)
+    return cache_settings.get('TIMEOUT', 300)
+
+
+def get_generations(models):
+    cache = get_cache()
+    keys = [GENERATION_KEY.format(model._meta.label_lower)
+            for model in models]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time(), None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generation(model):
+    get_cache().set(
+        GENERATION_KEY.format(model._meta.label_lower), time.time(), None)
+
+
+def make_response_key(request, view_name, models):
+    query = sorted(request.query_params.lists())
+    raw = (f'{view_name}|{request.get_host()}|{request.path}|{query}|'
+           f'{get_generations(models)}')
+    return RESPONSE_KEY.format(hashlib.md5(raw.encode()).hexdigest())
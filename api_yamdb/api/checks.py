@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from .cache import get_cache, get_cache_settings, is_process_local
+
+
+@register(Tags.caches)
+def check_response_cache(app_configs, **kwargs):
+    if settings.DEBUG or not is_process_local(get_cache()):
+        return []
+    return [Warning(
+        'Кэш ответов API хранится в памяти процесса: счётчики поколений '
+        'не общие для воркеров, и другие процессы отдают устаревшие '
+        'данные до истечения LOCAL_TIMEOUT.',
+        hint=(f'Укажите общий бэкенд (Redis, Memcached, база данных) для '
+              f'кэша "{get_cache_settings().get("ALIAS", "default")}".'),
+        id='api.W001')]
@@ -0,0 +1,100 @@
+from rest_framework import serializers
+
+_encoders = {}
+
+
+def skip_none(convert):
+    def encode(value):
+        return None if value is None else convert(value)
+    return encode
+
+
+def scalar_step(name, column, convert):
+    convert = skip_none(convert)
+
+    def encode(row, related):
+        return name, convert(row[column])
+    return encode
+
+
+def nested_step(name, key, children):
+    def encode(row, related):
+        if row[key] is None:
+            return name, None
+        return name, {child: convert(row[column])
+                      for child, column, convert in children}
+    return encode
+
+
+def many_step(name, key):
+    def encode(row, related):
+        return name, related[name].get(row[key], [])
+    return encode
+
+
+def compile_children(serializer, prefix=''):
+    return [(name, f'{prefix}{field.source}',
+             skip_none(field.to_representation))
+            for name, field in serializer.fields.items()]
+
+
+class RowEncoder:
+
+    def __init__(self, serializer_class, model):
+        self.pk = model._meta.pk.name
+        self.columns = [self.pk]
+        self.steps = []
+        self.many = {}
+        for name, field in serializer_class().fields.items():
+            if isinstance(field, serializers.ListSerializer):
+                model_field = model._meta.get_field(field.source)
+                self.many[name] = (model_field.related_model,
+                                   model_field.related_query_name(),
+                                   compile_children(field.child))
+                self.steps.append(many_step(name, self.pk))
+            elif isinstance(field, serializers.BaseSerializer):
+                children = compile_children(field, f'{field.source}__')
+                self.add_columns(field.source,
+                                 *(column for _, column, _ in children))
+                self.steps.append(nested_step(name, field.source, children))
+            elif isinstance(field, serializers.SlugRelatedField):
+                column = f'{field.source}__{field.slug_field}'
+                self.add_columns(column)
+                self.steps.append(scalar_step(name, column, lambda x: x))
+            else:
+                self.add_columns(field.source)
+                self.steps.append(
+                    scalar_step(name, field.source, field.to_representation))
+
+    def add_columns(self, *columns):
+        self.columns.extend(
+            column for column in columns if column not in self.columns)
+
+    def values(self, queryset):
+        return queryset.prefetch_related(None).values(*self.columns)
+
+    def fetch_many(self, rows):
+        ids = [row[self.pk] for row in rows]
+        related = {}
+        for name, (model, lookup, children) in self.many.items():
+            items = related[name] = {}
+            values = model.objects.filter(**{f'{lookup}__in': ids}).order_by(
+                'pk').values_list(lookup, *(column for _, column, _
+                                            in children))
+            for owner, *data in values:
+                items.setdefault(owner, []).append(
+                    {child: convert(value) for (child, _, convert), value
+                     in zip(children, data)})
+        return related
+
+    def encode(self, rows):
+        related = self.fetch_many(rows) if self.many and rows else {}
+        return [dict(step(row, related) for step in self.steps)
+                for row in rows]
+
+
+def get_row_encoder(serializer_class, model):
+    key = (serializer_class, model)
+    if key not in _encoders:
+        _encoders[key] = RowEncoder(serializer_class, model)
+    return _encoders[key]
@@ -1,6 +1,12 @@
+import sys
+
 import django_filters
+from rest_framework import filters
+
+from reviews.models import Title, fold_search
+from reviews.search import search_titles
 
-from reviews.models import Title
+SURROGATES = (0xD800, 0xDFFF)
 
 
 class TitleFilter(django_filters.rest_framework.FilterSet):
@@ -9,7 +15,33 @@ class TitleFilter(django_filters.rest_framework.FilterSet):
     year = django_filters.NumberFilter(field_name='year')
     name = django_filters.CharFilter(field_name='name',
                                      lookup_expr='icontains')
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Title
-        fields = ('name', 'year', 'genre', 'category')
+        fields = ('name', 'year', 'genre', 'category', 'search')
+
+    def filter_search(self, queryset, name, value):
+        return search_titles(queryset, value)
+
+
+class PrefixSearchFilter(filters.SearchFilter):
+    search_mode_param = 'search_mode'
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+        if params.get(self.search_mode_param) != 'prefix':
+            return super().filter_queryset(request, queryset, view)
+        field = getattr(view, 'prefix_search_field', None)
+        prefix = fold_search(params.get(self.search_param, '').strip())
+        if field is None or not prefix:
+            return queryset
+        upper = ord(prefix[-1]) + 1
+        if SURROGATES[0] <= upper <= SURROGATES[1]:
+            upper = SURROGATES[1] + 1
+        if upper > sys.maxunicode:
+            lookups = {f'{field}__startswith': prefix}
+        else:
+            lookups = {f'{field}__gte': prefix,
+                       f'{field}__lt': prefix[:-1] + chr(upper)}
+        return queryset.filter(**lookups).order_by(field, 'pk')
@@ -0,0 +1,90 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.benchmark import (ApiBenchmark, find_regressions, load_baseline,
+                           save_baseline, seed_dataset)
+
+
+class Command(BaseCommand):
+    help = 'Сквозные замеры производительности API с сохранением эталона'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100,
+                            help='Количество запросов к каждому адресу')
+        parser.add_argument(
+            '--concurrency', type=int, default=4,
+            help='Количество параллельных клиентов для GET-запросов')
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help='Замерить только указанный адрес')
+        parser.add_argument(
+            '--seed', action='store_true',
+            help='Перед замерами сгенерировать набор данных')
+        parser.add_argument('--users', type=int, default=1000,
+                            help='Количество пользователей в наборе')
+        parser.add_argument('--titles', type=int, default=1000,
+                            help='Количество произведений в наборе')
+        parser.add_argument('--reviews', type=int, default=10000,
+                            help='Количество отзывов в наборе')
+        parser.add_argument('--comments', type=int, default=10000,
+                            help='Количество комментариев в наборе')
+        parser.add_argument(
+            '--baseline', default=settings.BENCHMARK['BASELINE'],
+            help='JSON-файл с эталонными замерами')
+        parser.add_argument(
+            '--tolerance', type=float,
+            default=settings.BENCHMARK['TOLERANCE'],
+            help='Допустимое относительное ухудшение задержки и RPS')
+        parser.add_argument(
+            '--update-baseline', action='store_true',
+            help='Сохранить результаты как новый эталон')
+        parser.add_argument(
+            '--fail-on-regression', action='store_true',
+            help='Завершиться с ошибкой при ухудшении относительно эталона')
+
+    def handle(self, *args, **kwargs):
+        if kwargs['seed']:
+            try:
+                seed_dataset(users=kwargs['users'], titles=kwargs['titles'],
+                             reviews=kwargs['reviews'],
+                             comments=kwargs['comments'])
+            except ValueError as error:
+                raise CommandError(error)
+        benchmark = ApiBenchmark(requests=kwargs['requests'],
+                                 concurrency=kwargs['concurrency'])
+        try:
+            report = benchmark.run(kwargs['endpoints'])
+        except ValueError as error:
+            raise CommandError(error)
+        self.write_report(report)
+        previous = load_baseline(kwargs['baseline'])
+        regressions = []
+        if previous is None:
+            self.stdout.write('Эталон не найден, сравнение пропущено.')
+        else:
+            regressions = find_regressions(previous, report,
+                                           kwargs['tolerance'])
+            self.write_regressions(regressions)
+        if kwargs['update_baseline'] or previous is None:
+            save_baseline(kwargs['baseline'], report)
+            self.stdout.write(f'Эталон сохранён в {kwargs["baseline"]}.')
+        if regressions and kwargs['fail_on_regression']:
+            raise CommandError(
+                f'Обнаружено ухудшений: {len(regressions)}')
+
+    def write_report(self, report):
+        for name, result in report['endpoints'].items():
+            self.stdout.write(
+                f'{result["method"]:6} {name:28} '
+                f'p50 {result["p50"]:8.2f} мс  p95 {result["p95"]:8.2f} мс  '
+                f'p99 {result["p99"]:8.2f} мс  {result["rps"]:8.1f} RPS  '
+                f'{result["queries"]:3} запросов  '
+                f'{result["errors"]} ошибок')
+
+    def write_regressions(self, regressions):
+        for regression in regressions:
+            self.stdout.write(self.style.WARNING(
+                f'{regression.name}: {regression.metric} '
+                f'{regression.previous} -> {regression.current}'))
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(
+                'Ухудшений относительно эталона нет.'))
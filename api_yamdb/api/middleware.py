@@ -0,0 +1,36 @@
+from contextlib import ExitStack
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from .profiling import (QueryBudgetExceeded, QueryRecorder,
+                        get_profiler_settings, registry, resolve_view_name)
+
+
+class QueryProfilerMiddleware:
+
+    def __init__(self, get_response):
+        if not get_profiler_settings().get('ENABLED'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        view_name = resolve_view_name(request)
+        if view_name is None:
+            return response
+        registry.record(view_name, recorder)
+        config = get_profiler_settings()
+        budget = config.get('BUDGETS', {}).get(view_name)
+        if budget is not None and recorder.count > budget:
+            response['X-Query-Budget-Exceeded'] = (
+                f'{recorder.count}/{budget}')
+            if config.get('RAISE_ON_BUDGET'):
+                raise QueryBudgetExceeded(
+                    f'{view_name}: выполнено {recorder.count} SQL-запросов '
+                    f'при бюджете {budget}')
+        return response
@@ -0,0 +1,275 @@
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Max
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .cache import (get_cache, get_generations, get_response_timeout,
+                    make_response_key)
+from .encoders import get_row_encoder
+
+
+def conditional_response(request, etag, last_modified, handler):
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = handler()
+        if response.status_code != 200:
+            return response
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+class CachedListMixin:
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if request.user.is_authenticated or not self.cache_models:
+            return handler(request, *args, **kwargs)
+        cache = get_cache()
+        key = make_response_key(
+            request, f'{type(self).__name__}.{self.action}',
+            self.cache_models)
+        cached = cache.get(key)
+        if cached is not None:
+            data, etag, last_modified = cached
+            if etag is None:
+                return Response(data)
+            return conditional_response(
+                request, etag, last_modified, lambda: Response(data))
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            etag, last_modified = getattr(
+                response, 'validators', (None, None))
+            cache.set(key, (response.data, etag, last_modified),
+                      get_response_timeout())
+        return response
+
+
+class CachedRetrieveMixin(CachedListMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs)
+
+
+class ConditionalListMixin:
+    cache_models = ()
+    last_modified_field = None
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs)
+
+    def get_validator_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return queryset.order_by()
+
+    def get_validators(self, request):
+        aggregates = {'last_id': Max('pk')}
+        if self.last_modified_field:
+            aggregates['last_modified'] = Max(self.last_modified_field)
+        state = self.get_validator_queryset().aggregate(**aggregates)
+        if self.action == 'retrieve' and state['last_id'] is None:
+            return None, None
+        timestamps = get_generations(self.cache_models)
+        if state.get('last_modified'):
+            timestamps.append(state['last_modified'].timestamp())
+        raw = (f'{type(self).__name__}.{self.action}|'
+               f'{request.get_full_path()}|'
+               f'{request.META.get("HTTP_ACCEPT", "")}|'
+               f'{sorted(state.items())}|{timestamps}')
+        etag = quote_etag(hashlib.md5(raw.encode()).hexdigest())
+        if self.action != 'retrieve' or not timestamps:
+            return etag, None
+        return etag, int(max(timestamps))
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+        response = conditional_response(
+            request, etag, last_modified,
+            lambda: handler(request, *args, **kwargs))
+        response.validators = (etag, last_modified)
+        return response
+
+
+class ConditionalRetrieveMixin(ConditionalListMixin):
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs)
+
+
+class ParentObjectMixin:
+    parent_model = None
+    parent_lookups = {}
+
+    def get_parent(self):
+        if not hasattr(self, '_parent'):
+            self._parent = get_object_or_404(
+                self.parent_model,
+                **{field: self.kwargs.get(kwarg)
+                   for field, kwarg in self.parent_lookups.items()})
+        return self._parent
+
+
+class StatsViewMixin:
+    stats_queryset = None
+    stats_serializer_class = None
+    stats_lookup = None
+
+    @action(detail=False, url_path='stats')
+    def stats_list(self, request):
+        page = self.paginate_queryset(self.stats_queryset.all())
+        serializer = self.stats_serializer_class(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @action(detail=True)
+    def stats(self, request, **kwargs):
+        stats = get_object_or_404(self.stats_queryset, **{
+            self.stats_lookup: self.kwargs[self.lookup_field]})
+        return Response(self.stats_serializer_class(stats).data)
+
+
+class SparseQuerysetMixin:
+    sparse_params = ('fields', 'exclude')
+
+    def filter_queryset(self, queryset):
+        return self.prune_queryset(super().filter_queryset(queryset))
+
+    def get_sparse_columns(self, model):
+        columns = {model._meta.pk.name}
+        relations = set()
+        for field in self.get_serializer().fields.values():
+            name = field.source.split('.')[0]
+            if name == '*':
+                return None, None
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if model_field.is_relation:
+                relations.add(name)
+            if model_field.concrete and not model_field.many_to_many:
+                columns.add(name)
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        columns.update(name.lstrip('-') for name in ordering)
+        return columns, relations
+
+    def prune_queryset(self, queryset):
+        params = self.request.query_params
+        if self.request.method != 'GET' or not any(
+                param in params for param in self.sparse_params):
+            return queryset
+        columns, relations = self.get_sparse_columns(queryset.model)
+        if columns is None:
+            return queryset
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict):
+            select_related = [name for name in select_related
+                              if name in relations]
+        prefetch_related = [
+            lookup for lookup in queryset._prefetch_related_lookups
+            if getattr(lookup, 'prefetch_to', lookup).split('__')[0]
+            in relations]
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if select_related:
+            queryset = queryset.select_related(
+                *([] if select_related is True else select_related))
+        return queryset.prefetch_related(*prefetch_related).only(*columns)
+
+
+class FastListMixin:
+    fast_list_skip_params = SparseQuerysetMixin.sparse_params
+
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+
+    def use_fast_list(self, queryset):
+        params = self.request.query_params
+        return (getattr(settings, 'FAST_LIST_RENDERING', False)
+                and not any(param in params
+                            for param in self.fast_list_skip_params)
+                and not queryset.query.extra
+                and not queryset.query.annotations)
+
+    def list_response(self, queryset):
+        encoder = None
+        if self.use_fast_list(queryset):
+            encoder = get_row_encoder(
+                self.get_serializer_class(), queryset.model)
+            queryset = encoder.values(queryset)
+        page = self.paginate_queryset(queryset)
+        items = queryset if page is None else page
+        if encoder is None:
+            data = self.get_serializer(items, many=True).data
+        else:
+            data = encoder.encode(list(items))
+        if page is None:
+            return Response(data)
+        return self.get_paginated_response(data)
+
+
+class BulkCreateMixin:
+    bulk_error_modes = ('abort', 'skip')
+
+    def create(self, request, *args, **kwargs):
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        return self.bulk_response(
+            self.get_bulk_serializer(data=request.data),
+            status.HTTP_201_CREATED)
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        mode = self.request.query_params.get(
+            'on_error', getattr(settings, 'BULK_ON_ERROR', 'abort'))
+        if mode not in self.bulk_error_modes:
+            raise ValidationError({'on_error': (
+                f'Ожидается одно из значений: '
+                f'{", ".join(self.bulk_error_modes)}')})
+        context = self.get_serializer_context()
+        context['on_error'] = mode
+        return self.get_serializer_class()(
+            *args, many=True, context=context, **kwargs)
+
+    def bulk_response(self, serializer, status_code):
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        if serializer.context['on_error'] != 'skip':
+            return Response(serializer.data, status=status_code)
+        return Response({
+            'results': serializer.data,
+            'errors': [{'index': index, 'errors': errors} for index, errors
+                       in sorted(serializer.item_errors.items())],
+        }, status=status_code)
+
+
+class BulkUpdateMixin(BulkCreateMixin):
+
+    @action(detail=False, methods=['patch'], url_path='bulk')
+    def bulk_update(self, request):
+        return self.bulk_response(
+            self.get_bulk_serializer(
+                self.get_queryset().prefetch_related(None),
+                data=request.data, partial=True),
+            status.HTTP_200_OK)
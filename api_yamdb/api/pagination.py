@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+
+POSITION_SEPARATOR = '|'
+
+
+class PubDateCursorPagination(pagination.CursorPagination):
+    ordering = ('-pub_date', '-id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, current_position = 0, False, None
+        else:
+            offset, reverse, current_position = self.cursor
+        if reverse:
+            queryset = queryset.order_by(
+                *pagination._reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(
+                self.after_position(current_position, reverse))
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering)
+        has_moved = current_position is not None or offset > 0
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = (
+                has_moved, following_position is not None)
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next, self.has_previous = (
+                following_position is not None, has_moved)
+            self.next_position = following_position
+            self.previous_position = current_position
+        if (self.has_previous or self.has_next) and self.template:
+            self.display_page_controls = True
+        return self.page
+
+    def after_position(self, position, reverse):
+        pub_date, _, pk = position.rpartition(POSITION_SEPARATOR)
+        pub_date = parse_datetime(pub_date)
+        if pub_date is None or not pk.isdigit():
+            raise NotFound(self.invalid_cursor_message)
+        lookup = 'gt' if reverse else 'lt'
+        return (Q(**{f'pub_date__{lookup}': pub_date})
+                | Q(pub_date=pub_date, **{f'id__{lookup}': int(pk)}))
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            pub_date, pk = instance['pub_date'], instance['id']
+        else:
+            pub_date, pk = instance.pub_date, instance.id
+        return f'{pub_date.isoformat()}{POSITION_SEPARATOR}{pk}'
+
+
+class SelectablePaginationMixin:
+    pagination_classes = {
+        'page': pagination.PageNumberPagination,
+        'cursor': PubDateCursorPagination,
+    }
+    pagination_query_param = 'pagination'
+
+    def get_pagination_mode(self):
+        params = self.request.query_params
+        if PubDateCursorPagination.cursor_query_param in params:
+            return 'cursor'
+        mode = params.get(self.pagination_query_param)
+        if mode in self.pagination_classes:
+            return mode
+        return getattr(settings, 'REVIEWS_PAGINATION', 'page')
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = self.pagination_classes[
+                self.get_pagination_mode()]()
+        return self._paginator
@@ -1,5 +1,24 @@
 from rest_framework import permissions
 
+from reviews.models import Roles
+
+
+def has_role_claims(request):
+    return request.auth is not None and 'role' in request.auth
+
+
+def is_admin(request):
+    if has_role_claims(request):
+        return bool(request.auth['role'] == Roles.get_admin()
+                    or request.auth.get('is_staff'))
+    return request.user.is_admin
+
+
+def is_moderator(request):
+    if has_role_claims(request):
+        return request.auth['role'] == Roles.get_moderator()
+    return request.user.is_moderator
+
 
 class AdminOrReadOnnly(permissions.BasePermission):
 
@@ -7,14 +26,14 @@ class AdminOrReadOnnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         if request.user.is_authenticated:
-            return request.user.is_admin
+            return is_admin(request)
         return False
 
 
 class Admin(permissions.BasePermission):
     def has_permission(self, request, view):
         if request.user.is_authenticated:
-            return request.user.is_admin
+            return is_admin(request)
         return False
 
 
@@ -28,7 +47,7 @@ class AdminModeratorAuthorPermission(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.user.is_authenticated:
             return (
-                request.user.is_admin
-                or request.user.is_moderator
-                or obj.author == request.user)
+                is_admin(request)
+                or is_moderator(request)
+                or obj.author_id == request.user.pk)
         return bool(request.method in permissions.SAFE_METHODS)
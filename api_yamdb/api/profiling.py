@@ -0,0 +1,104 @@
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+
+HISTOGRAM_BOUNDS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def get_profiler_settings():
+    return getattr(settings, 'QUERY_PROFILER', {})
+
+
+def resolve_view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+    view_class = getattr(match.func, 'cls', None)
+    if view_class is None:
+        return match.view_name or match.func.__name__
+    actions = getattr(match.func, 'actions', None)
+    if actions:
+        method = request.method.lower()
+        return f'{view_class.__name__}.{actions.get(method, method)}'
+    return view_class.__name__
+
+
+class QueryRecorder:
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_sql = None
+        self.slowest_duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            if duration >= self.slowest_duration:
+                self.slowest_duration = duration
+                self.slowest_sql = sql
+
+
+class ProfileRegistry:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def record(self, view_name, recorder):
+        with self._lock:
+            stats = self._views.setdefault(view_name, {
+                'requests': 0,
+                'queries': 0,
+                'max_queries': 0,
+                'db_time': 0.0,
+                'slowest_sql': None,
+                'slowest_time': 0.0,
+                'histogram': [0] * (len(HISTOGRAM_BOUNDS) + 1),
+            })
+            stats['requests'] += 1
+            stats['queries'] += recorder.count
+            stats['max_queries'] = max(stats['max_queries'], recorder.count)
+            stats['db_time'] += recorder.duration
+            if recorder.slowest_duration >= stats['slowest_time']:
+                stats['slowest_time'] = recorder.slowest_duration
+                stats['slowest_sql'] = recorder.slowest_sql
+            stats['histogram'][
+                bisect_left(HISTOGRAM_BOUNDS, recorder.count)] += 1
+
+    def snapshot(self):
+        labels = [f'<={bound}' for bound in HISTOGRAM_BOUNDS]
+        labels.append(f'>{HISTOGRAM_BOUNDS[-1]}')
+        with self._lock:
+            return {
+                view_name: {
+                    'requests': stats['requests'],
+                    'avg_queries': stats['queries'] / stats['requests'],
+                    'max_queries': stats['max_queries'],
+                    'avg_db_time_ms': (
+                        stats['db_time'] * 1000 / stats['requests']),
+                    'total_db_time_ms': stats['db_time'] * 1000,
+                    'slowest_sql': stats['slowest_sql'],
+                    'slowest_time_ms': stats['slowest_time'] * 1000,
+                    'histogram': dict(zip(labels, stats['histogram'])),
+                }
+                for view_name, stats in sorted(self._views.items())
+            }
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+registry = ProfileRegistry()
@@ -1,26 +1,264 @@
-from django.core.exceptions import ValidationError
-from django.shortcuts import get_object_or_404
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils.encoding import smart_str
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueValidator
 
+from reviews.bulk import (create_categories, create_genres, create_titles,
+                          update_titles)
+from reviews.genres import set_title_genres
 from reviews.models import (QUATERNARY_GEOLOGICAL_PERIOD, TODAYS_YEAR,
-                            Category, Comment, Genre, Review, Title, User)
-
-
-class CategorySerializer(serializers.ModelSerializer):
+                            Category, CategoryStats, Comment, Genre,
+                            GenreStats, Review, Title, User)
+from .cache import bump_generation
+
+
+def parse_field_list(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def is_slug_value(value):
+    return isinstance(value, (str, int)) and not isinstance(value, bool)
+
+
+class ManySlugRelatedField(serializers.ManyRelatedField):
+    default_error_messages = {
+        'does_not_exist': 'Не найдены объекты с {slug_name}: {values}.',
+    }
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        child = self.child_relation
+        slugs = {}
+        for item in data:
+            if not is_slug_value(item):
+                child.fail('invalid')
+            slugs[str(item)] = None
+        found = child.lookup(list(slugs))
+        missing = [slug for slug in slugs if slug not in found]
+        if missing:
+            self.fail('does_not_exist', slug_name=child.slug_field,
+                      values=', '.join(missing))
+        return [found[slug] for slug in slugs]
+
+
+class BulkSlugRelatedField(serializers.SlugRelatedField):
+    slug_cache = None
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return ManySlugRelatedField(**list_kwargs)
+
+    def lookup(self, slugs):
+        if self.slug_cache is not None:
+            return {slug: self.slug_cache[slug] for slug in slugs
+                    if slug in self.slug_cache}
+        return {str(getattr(obj, self.slug_field)): obj
+                for obj in self.get_queryset().filter(
+                    **{f'{self.slug_field}__in': slugs})}
+
+    def to_internal_value(self, data):
+        if self.slug_cache is None:
+            return super().to_internal_value(data)
+        if not is_slug_value(data):
+            self.fail('invalid')
+        if str(data) not in self.slug_cache:
+            self.fail('does_not_exist', slug_name=self.slug_field,
+                      value=smart_str(data))
+        return self.slug_cache[str(data)]
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    default_error_messages = {
+        'max_items': 'Не более {limit} объектов за один запрос.',
+        'not_found': 'Объект не найден.',
+        'duplicate': 'Объект указан в запросе несколько раз.',
+    }
+    item_errors = None
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('allow_empty', False)
+        super().__init__(*args, **kwargs)
+
+    def relation_fields(self):
+        for name, field in self.child.fields.items():
+            if isinstance(field, ManySlugRelatedField):
+                yield name, field.child_relation
+            elif isinstance(field, BulkSlugRelatedField):
+                yield name, field
+
+    def prefetch_relations(self, data):
+        for name, relation in self.relation_fields():
+            slugs = set()
+            for item in data:
+                value = item.get(name) if isinstance(item, dict) else None
+                values = value if isinstance(value, list) else [value]
+                slugs.update(str(value) for value in values
+                             if is_slug_value(value))
+            relation.slug_cache = None
+            relation.slug_cache = relation.lookup(list(slugs))
+
+    def unique_errors(self, data):
+        errors = defaultdict(dict)
+        for name, field in self.child.fields.items():
+            unique = [validator for validator in field.validators
+                      if isinstance(validator, UniqueValidator)]
+            if not unique:
+                continue
+            field.validators = [validator for validator in field.validators
+                                if validator not in unique]
+            values = {index: item[name] for index, item in enumerate(data)
+                      if isinstance(item, dict)
+                      and isinstance(item.get(name), str)}
+            taken = set(unique[0].queryset.filter(
+                **{f'{field.source}__in': set(values.values())}
+            ).values_list(field.source, flat=True))
+            for index, value in values.items():
+                if value in taken:
+                    errors[index][name] = [unique[0].message]
+                taken.add(value)
+        return errors
+
+    def instance_errors(self, data):
+        ids = [item.get('id') if isinstance(item, dict) else None
+               for item in data]
+        self.instance_map = self.instance.in_bulk(
+            [pk for pk in ids if isinstance(pk, int)
+             and not isinstance(pk, bool)])
+        errors = {}
+        seen = set()
+        for index, pk in enumerate(ids):
+            if pk in seen:
+                errors[index] = {'id': [self.error_messages['duplicate']]}
+            elif isinstance(pk, bool) or pk not in self.instance_map:
+                errors[index] = {'id': [self.error_messages['not_found']]}
+            seen.add(pk)
+        return errors
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not data:
+            return super().to_internal_value(data)
+        limit = settings.BULK_MAX_ITEMS
+        if len(data) > limit:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    self.error_messages['max_items'].format(limit=limit)]})
+        self.prefetch_relations(data)
+        if self.instance is None:
+            errors = self.unique_errors(data)
+        else:
+            errors = self.instance_errors(data)
+        valid = []
+        self.valid_indexes = []
+        for index, item in enumerate(data):
+            try:
+                validated = self.child.run_validation(item)
+            except serializers.ValidationError as exc:
+                errors[index] = {**exc.detail, **errors.get(index, {})}
+                continue
+            if index not in errors:
+                valid.append(validated)
+                self.valid_indexes.append(index)
+        errors = dict(errors)
+        if errors and (self.context.get('on_error') != 'skip' or not valid):
+            raise serializers.ValidationError(
+                [errors.get(index, {}) for index in range(len(data))])
+        self.item_errors = errors
+        return valid
+
+    def create(self, validated_data):
+        return self.child.bulk_create(validated_data)
+
+    def update(self, instance, validated_data):
+        return self.child.bulk_update([
+            (self.instance_map[self.initial_data[index]['id']], attrs)
+            for index, attrs in zip(self.valid_indexes, validated_data)])
+
+    def save(self, **kwargs):
+        with transaction.atomic():
+            instances = super().save(**kwargs)
+        model = self.child.Meta.model
+        bump_generation(model)
+        for field in model._meta.many_to_many:
+            bump_generation(field.remote_field.through)
+        return instances
+
+
+class SparseFieldsMixin:
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        params = request.query_params
+        names = set(self.fields)
+        if 'fields' in params:
+            names &= parse_field_list(params['fields'])
+        names -= parse_field_list(params.get('exclude', ''))
+        for name in set(self.fields) - names:
+            self.fields.pop(name)
+
+
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Category
         fields = ('name', 'slug', )
+        list_serializer_class = BulkListSerializer
+
+    def bulk_create(self, items):
+        return create_categories([Category(**attrs) for attrs in items])
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         model = Genre
         fields = ('name', 'slug', )
+        list_serializer_class = BulkListSerializer
 
+    def bulk_create(self, items):
+        return create_genres([Genre(**attrs) for attrs in items])
 
-class TitleSerializer(serializers.ModelSerializer):
+
+class CategoryStatsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    name = serializers.CharField(source='category.name')
+    slug = serializers.CharField(source='category.slug')
+    review_count = serializers.IntegerField(source='rating_count')
+    rating = serializers.FloatField()
+
+    class Meta:
+        model = CategoryStats
+        fields = ('name', 'slug', 'title_count', 'review_count', 'rating', )
+        read_only_fields = fields
+
+
+class GenreStatsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    name = serializers.CharField(source='genre.name')
+    slug = serializers.CharField(source='genre.slug')
+    review_count = serializers.IntegerField(source='rating_count')
+    rating = serializers.FloatField()
+
+    class Meta:
+        model = GenreStats
+        fields = ('name', 'slug', 'title_count', 'review_count', 'rating', )
+        read_only_fields = fields
+
+
+class TitleSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(many=True, read_only=True)
     rating = serializers.IntegerField(read_only=True, default=None)
@@ -33,17 +271,54 @@ class TitleSerializer(serializers.ModelSerializer):
 
 
 class TitleEditSerializer(serializers.ModelSerializer):
-    category = serializers.SlugRelatedField(slug_field='slug',
-                                            queryset=Category.objects.all())
-    genre = serializers.SlugRelatedField(slug_field='slug',
-                                         queryset=Genre.objects.all(),
-                                         many=True)
+    category = BulkSlugRelatedField(slug_field='slug',
+                                    queryset=Category.objects.all())
+    genre = BulkSlugRelatedField(slug_field='slug',
+                                 queryset=Genre.objects.all(),
+                                 many=True)
     rating = serializers.IntegerField(read_only=True, default=None)
 
     class Meta:
         model = Title
         fields = ('id', 'name', 'year', 'description',
                   'genre', 'category', 'rating',)
+        list_serializer_class = BulkListSerializer
+
+    @staticmethod
+    def split_genres(attrs):
+        attrs = dict(attrs)
+        return attrs, attrs.pop('genre', None)
+
+    @staticmethod
+    def fetch_titles(titles):
+        fetched = Title.objects.select_related('category').prefetch_related(
+            Prefetch('genre', queryset=Genre.objects.order_by('pk'))
+        ).in_bulk([title.pk for title in titles])
+        return [fetched[title.pk] for title in titles]
+
+    def bulk_create(self, items):
+        titles = create_titles([
+            (Title(**attrs), genres)
+            for attrs, genres in map(self.split_genres, items)])
+        return self.fetch_titles(titles)
+
+    def bulk_update(self, items):
+        titles = update_titles([
+            (title, *self.split_genres(attrs)) for title, attrs in items])
+        return self.fetch_titles(titles)
+
+    def create(self, validated_data):
+        genres = validated_data.pop('genre')
+        title = super().create(validated_data)
+        set_title_genres(title, genres, created=True)
+        return title
+
+    def update(self, instance, validated_data):
+        genres = validated_data.pop('genre', None)
+        title = super().update(instance, validated_data)
+        if genres is not None:
+            set_title_genres(title, genres)
+        return title
 
     def validate_year(self, value):
         now_year = TODAYS_YEAR
@@ -57,7 +332,7 @@ class TitleEditSerializer(serializers.ModelSerializer):
         return value
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         fields = ('username', 'email', 'first_name',
@@ -65,7 +340,7 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
 
 
-class UserMeSerializer(serializers.ModelSerializer):
+class UserMeSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     class Meta:
         fields = ('username', 'email', 'first_name',
@@ -90,7 +365,7 @@ class SendTokenSerializer(serializers.Serializer):
     confirmation_code = serializers.CharField(required=True)
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         many=False,
         read_only=True,
@@ -102,7 +377,7 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'pub_date',)
 
 
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         many=False,
         read_only=True,
@@ -112,16 +387,3 @@ class ReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date',)
-
-    def validate(self, data):
-        request = self.context['request']
-        author = request.user
-        title_id = self.context.get('view').kwargs.get('title_id')
-        title = get_object_or_404(Title, pk=title_id)
-        if (
-            request.method == "POST"
-            and Review.objects.filter(title=title, author=author).exists()
-        ):
-            raise ValidationError(
-                'Один автор, может оставить только один обзор на произведение')
-        return data
@@ -0,0 +1,48 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+from django.dispatch import receiver
+
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+from .authentication import invalidate_user
+from .cache import bump_generation
+
+VERSIONED_MODELS = (Category, Comment, Genre, GenreTitle, Review, Title)
+AUTHORED_MODELS = (Comment, Review)
+
+
+def bump_model_generation(sender, **kwargs):
+    bump_generation(sender)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_model_generation, sender=model,
+                      dispatch_uid=f'cache-save-{model.__name__}')
+    post_delete.connect(bump_model_generation, sender=model,
+                        dispatch_uid=f'cache-delete-{model.__name__}')
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, action, **kwargs):
+    if action.startswith('post_'):
+        bump_generation(GenreTitle)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_authenticated_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, **kwargs):
+    instance.username_changed = instance.pk is not None and not (
+        User.objects.filter(pk=instance.pk, username=instance.username)
+        .exists())
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_names(sender, instance, created, **kwargs):
+    if not created and instance.username_changed:
+        for model in AUTHORED_MODELS:
+            bump_generation(model)
@@ -0,0 +1,45 @@
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class IPRateThrottle(SimpleRateThrottle):
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class FieldRateThrottle(SimpleRateThrottle):
+    field = None
+
+    def get_cache_key(self, request, view):
+        data = request.data
+        value = data.get(self.field) if hasattr(data, 'get') else None
+        if not isinstance(value, str) or not value.strip():
+            return None
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': hashlib.md5(
+                value.strip().lower().encode()).hexdigest(),
+        }
+
+
+class SignupIPThrottle(IPRateThrottle):
+    scope = 'signup'
+
+
+class SignupEmailThrottle(FieldRateThrottle):
+    scope = 'signup_email'
+    field = 'email'
+
+
+class TokenIPThrottle(IPRateThrottle):
+    scope = 'token'
+
+
+class TokenUsernameThrottle(FieldRateThrottle):
+    scope = 'token_username'
+    field = 'username'
@@ -0,0 +1,13 @@
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+class RoleAccessToken(AccessToken):
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.username
+        token['role'] = user.role
+        token['is_staff'] = user.is_staff
+        token['ver'] = user.token_version
+        return token
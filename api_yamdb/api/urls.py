@@ -2,8 +2,8 @@ from django.urls import include, path
 from rest_framework import routers
 
 from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet, UserViewSet, send_code,
-                    send_token)
+                    ReviewViewSet, TitleViewSet, UserViewSet, query_profile,
+                    send_code, send_token)
 
 router = routers.SimpleRouter()
 router.register('categories', CategoryViewSet)
@@ -25,6 +25,7 @@ urlpatterns = [
     path('', include(router.urls)),
     path('auth/signup/', send_code),
     path('auth/token/', send_token),
+    path('profiling/queries/', query_profile),
 ]
 
 urlpatterns = [path('v1/', include(urlpatterns))]
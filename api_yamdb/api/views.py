@@ -1,48 +1,82 @@
 from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch, Q
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, mixins, pagination, status, viewsets
-from rest_framework.decorators import action, api_view
+from rest_framework import mixins, pagination, status, viewsets
+from rest_framework.decorators import (action, api_view, permission_classes,
+                                       throttle_classes)
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import AccessToken
 
-from reviews.models import Category, Genre, Review, Title, User
-from .filters import TitleFilter
+from reviews.models import (TOKEN_CLAIM_FIELDS, Category, CategoryStats,
+                            Comment, Genre, GenreStats, GenreTitle, Review,
+                            Title, User)
+from reviews.outbox import enqueue_mail
+from .filters import PrefixSearchFilter, TitleFilter
+from .mixins import (BulkCreateMixin, BulkUpdateMixin, CachedListMixin,
+                     CachedRetrieveMixin, ConditionalListMixin,
+                     ConditionalRetrieveMixin, FastListMixin,
+                     ParentObjectMixin, SparseQuerysetMixin, StatsViewMixin)
+from .pagination import SelectablePaginationMixin
 from .permissions import (Admin, AdminModeratorAuthorPermission,
                           AdminOrReadOnnly)
-from .serializers import (CategorySerializer, CommentSerializer,
-                          GenreSerializer, ReviewSerializer,
+from .profiling import registry
+from .serializers import (CategorySerializer, CategoryStatsSerializer,
+                          CommentSerializer, GenreSerializer,
+                          GenreStatsSerializer, ReviewSerializer,
                           SendCodeSerializer, SendTokenSerializer,
                           TitleEditSerializer, TitleSerializer,
                           UserMeSerializer, UserSerializer)
+from .throttling import (SignupEmailThrottle, SignupIPThrottle,
+                         TokenIPThrottle, TokenUsernameThrottle)
+from .tokens import RoleAccessToken
 
 
-class CreateListDestroyViewSet(mixins.CreateModelMixin,
+class CreateListDestroyViewSet(BulkCreateMixin,
+                               CachedListMixin,
+                               ConditionalListMixin,
+                               mixins.CreateModelMixin,
                                mixins.ListModelMixin,
                                mixins.DestroyModelMixin,
                                viewsets.GenericViewSet, ):
     lookup_field = 'slug'
     permission_classes = (AdminOrReadOnnly, )
-    filter_backends = (filters.SearchFilter, )
+    filter_backends = (PrefixSearchFilter, )
     search_fields = ('name', )
+    prefix_search_field = 'name_search'
 
 
-class CategoryViewSet(CreateListDestroyViewSet):
+class CategoryViewSet(StatsViewMixin, CreateListDestroyViewSet):
     serializer_class = CategorySerializer
     queryset = Category.objects.all()
+    cache_models = (Category, )
+    stats_queryset = CategoryStats.objects.select_related(
+        'category').order_by('category__slug')
+    stats_serializer_class = CategoryStatsSerializer
+    stats_lookup = 'category__slug'
 
 
-class GenreViewSet(CreateListDestroyViewSet):
+class GenreViewSet(StatsViewMixin, CreateListDestroyViewSet):
     serializer_class = GenreSerializer
     queryset = Genre.objects.all()
+    cache_models = (Genre, )
+    stats_queryset = GenreStats.objects.select_related(
+        'genre').order_by('genre__slug')
+    stats_serializer_class = GenreStatsSerializer
+    stats_lookup = 'genre__slug'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg('reviews__score'))
+class TitleViewSet(CachedRetrieveMixin, ConditionalRetrieveMixin,
+                   SparseQuerysetMixin, FastListMixin, BulkUpdateMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.select_related('category').prefetch_related(
+        Prefetch('genre', queryset=Genre.objects.order_by('pk'))
+    ).order_by('id')
+    cache_models = (Title, Category, Genre, GenreTitle, Review)
     serializer_class = TitleSerializer
     permission_classes = (AdminOrReadOnnly, )
     filter_backends = (DjangoFilterBackend, )
@@ -53,58 +87,100 @@ class TitleViewSet(viewsets.ModelViewSet):
             return TitleSerializer
         return TitleEditSerializer
 
+    def get_min_reviews(self):
+        value = self.request.query_params.get(
+            'min_reviews', settings.TOP_TITLES_MIN_REVIEWS)
+        try:
+            return max(int(value), 1)
+        except (TypeError, ValueError):
+            raise ValidationError(
+                {'min_reviews': 'Ожидается целое число'})
+
+    @action(detail=False)
+    def top(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            rating_count__gte=self.get_min_reviews())
+        return self.list_response(queryset.order_by('-rating', 'id'))
+
+    @action(detail=False)
+    def trending(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            trending__isnull=False)
+        return self.list_response(queryset.order_by('-trending', 'id'))
+
 
 class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = (Admin,)
-    filter_backends = (filters.SearchFilter,)
+    filter_backends = (PrefixSearchFilter,)
     search_fields = ('username',)
+    prefix_search_field = 'username_search'
     pagination_class = pagination.PageNumberPagination
     lookup_field = 'username'
 
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        if any(serializer.validated_data.get(field, getattr(instance, field))
+               != getattr(instance, field) for field in TOKEN_CLAIM_FIELDS):
+            serializer.save(token_version=instance.token_version + 1)
+        else:
+            serializer.save()
+
     @action(detail=False, permission_classes=(IsAuthenticated, ),
             methods=['get', 'patch'], url_path='me',
             serializer_class=UserMeSerializer)
     def get_or_patch_me(self, request):
+        user = request.user
+        if getattr(user, 'from_token_claims', False):
+            user = get_object_or_404(User, pk=user.pk)
         if request.method == 'GET':
-            serializer = self.get_serializer(request.user, many=False)
+            serializer = self.get_serializer(user, many=False)
             return Response(serializer.data)
         serializer = self.get_serializer(
-            instance=request.user, data=request.data, partial=True)
+            instance=user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        self.perform_update(serializer)
         return Response(serializer.data)
 
 
 def yamdb_send_mail(confirmation_code, email):
-    return send_mail(
+    return enqueue_mail(
         subject='Ваш код подтверждения на yambd.com',
         message=f'Ваш код подтверждения на yambd.com: {confirmation_code}',
         from_email=settings.EMAIL_YAMDB,
-        recipient_list=[email],
+        recipient=email,
     )
 
 
 @api_view(['POST'])
+@throttle_classes((SignupIPThrottle, SignupEmailThrottle))
 def send_code(request):
     serializer = SendCodeSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
     username = serializer.validated_data.get('username')
     email = serializer.validated_data.get('email')
-    user = User.objects.filter(username=username).exists()
-    mail = User.objects.filter(email=email).exists()
-    if user and not mail:
-        return Response('Имя пользователя уже существует',
+    matches = list(User.objects.filter(
+        Q(username=username) | Q(email=email))[:2])
+    user = next((match for match in matches
+                 if match.username == username and match.email == email),
+                None)
+    if user is None and matches:
+        if all(match.username == username for match in matches):
+            return Response('Имя пользователя уже существует',
+                            status=status.HTTP_400_BAD_REQUEST)
+        if all(match.email == email for match in matches):
+            return Response('Почта уже используется',
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response('Имя пользователя или почта уже существует',
                         status=status.HTTP_400_BAD_REQUEST)
-    if mail and not user:
-        return Response('Почта уже используется',
-                        status=status.HTTP_400_BAD_REQUEST)
-    try:
-        user = User.objects.get_or_create(username=username, email=email)[0]
-    except NameError:
-        Response('Имя пользователя или почта уже существует',
-                 status=status.HTTP_400_BAD_REQUEST)
+    if user is None:
+        try:
+            with transaction.atomic():
+                user = User.objects.create(username=username, email=email)
+        except IntegrityError:
+            return Response('Имя пользователя или почта уже существует',
+                            status=status.HTTP_400_BAD_REQUEST)
     confirmation_code = default_token_generator.make_token(user)
     yamdb_send_mail(confirmation_code, email)
     message = {'email': email, 'username': username}
@@ -112,6 +188,7 @@ def send_code(request):
 
 
 @api_view(['POST'])
+@throttle_classes((TokenIPThrottle, TokenUsernameThrottle))
 def send_token(request):
     serializer = SendTokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -119,42 +196,64 @@ def send_token(request):
     token = serializer.validated_data.get('confirmation_code')
     user = get_object_or_404(User, username=username)
     if default_token_generator.check_token(user, token):
-        token = AccessToken.for_user(user)
+        if settings.JWT_ROLE_CLAIMS:
+            token = RoleAccessToken.for_user(user)
+        else:
+            token = AccessToken.for_user(user)
         return Response({'token': f'{token}'}, status=status.HTTP_200_OK)
     return Response('Неверный код подтверждения',
                     status=status.HTTP_400_BAD_REQUEST)
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ConditionalRetrieveMixin, SelectablePaginationMixin,
+                     ParentObjectMixin, SparseQuerysetMixin,
+                     viewsets.ModelViewSet):
     serializer_class = CommentSerializer
     permission_classes = (AdminModeratorAuthorPermission, )
+    cache_models = (Comment, )
+    last_modified_field = 'pub_date'
+
+    parent_model = Review
+    parent_lookups = {'id': 'review_id', 'title': 'title_id'}
 
     def get_queryset(self):
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title=self.kwargs.get('title_id'))
-        return review.comments.all()
+        return self.get_parent().comments.select_related('author')
 
     def perform_create(self, serializer):
-        review = get_object_or_404(
-            Review,
-            id=self.kwargs.get('review_id'),
-            title=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, review=review)
+        serializer.save(author=self.request.user, review=self.get_parent())
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalRetrieveMixin, SelectablePaginationMixin,
+                    ParentObjectMixin, SparseQuerysetMixin, FastListMixin,
+                    viewsets.ModelViewSet):
     serializer_class = ReviewSerializer
     permission_classes = (AdminModeratorAuthorPermission,)
+    cache_models = (Review, )
+    last_modified_field = 'pub_date'
+    parent_model = Title
+    parent_lookups = {'id': 'title_id'}
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        return title.reviews.all()
+        return self.get_parent().reviews.select_related('author')
 
     def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs.get('title_id'))
-        serializer.save(author=self.request.user, title=title)
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user,
+                                title=self.get_parent())
+        except IntegrityError:
+            if not Review.objects.filter(
+                    author=self.request.user, title=self.get_parent()
+            ).exists():
+                raise
+            raise ValidationError(
+                'Один автор, может оставить только один обзор на произведение')
+
 
-    def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs.get('title_id'))
+@api_view(['GET', 'DELETE'])
+@permission_classes((Admin, ))
+def query_profile(request):
+    if request.method == 'DELETE':
+        registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(registry.snapshot())
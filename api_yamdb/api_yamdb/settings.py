@@ -40,6 +40,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.QueryProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -115,12 +116,37 @@ AUTH_USER_MODEL = 'reviews.User'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_RATES': {
+        'signup': '20/hour',
+        'signup_email': '5/hour',
+        'token': '30/hour',
+        'token_username': '10/hour',
+    },
 }
 
+USER_CACHE_TIMEOUT = 60
+
+JWT_ROLE_CLAIMS = os.getenv('JWT_ROLE_CLAIMS', default='') == 'True'
+
+REVIEWS_PAGINATION = os.getenv('REVIEWS_PAGINATION', default='page')
+
+TITLE_SEARCH_BACKEND = os.getenv('TITLE_SEARCH_BACKEND', default='auto')
+
+TOP_TITLES_MIN_REVIEWS = 1
+
+BULK_MAX_ITEMS = 1000
+
+BULK_ON_ERROR = 'abort'
+
+FAST_LIST_RENDERING = os.getenv(
+    'FAST_LIST_RENDERING', default='') == 'True'
+
+TRENDING_HALF_LIFE_DAYS = 7
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
@@ -153,6 +179,42 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='yamdb'),
+    }
+}
+
+API_CACHE = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,
+    'LOCAL_TIMEOUT': 5,
+}
+
+QUERY_PROFILER = {
+    'ENABLED': os.getenv('QUERY_PROFILER_ENABLED', default='') == 'True',
+    'RAISE_ON_BUDGET': False,
+    'BUDGETS': {},
+}
+
+BENCHMARK = {
+    'BASELINE': os.getenv(
+        'BENCHMARK_BASELINE',
+        default=os.path.join(BASE_DIR, 'benchmarks', 'api_baseline.json')),
+    'TOLERANCE': float(os.getenv('BENCHMARK_TOLERANCE', default=0.2)),
+}
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 EMAIL_YAMDB = 'registration@yambd.com'
+
+MAIL_OUTBOX = {
+    'BATCH_SIZE': 100,
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF': 60,
+    'MAX_BACKOFF': 3600,
+    'LEASE': 300,
+}
@@ -1,9 +1,16 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Genre, Review, Title, User
+from .models import (TOKEN_CLAIM_FIELDS, Category, Comment, Genre,
+                     OutgoingMail, Review, Title, User)
 
 
-admin.site.register(User)
+@admin.register(User)
+class UserAdmin(admin.ModelAdmin):
+
+    def save_model(self, request, obj, form, change):
+        if change and set(form.changed_data) & set(TOKEN_CLAIM_FIELDS):
+            obj.token_version += 1
+        super().save_model(request, obj, form, change)
 
 
 @admin.register(Title)
@@ -59,3 +66,18 @@ class ReviewAdmin(admin.ModelAdmin):
         'text',
         'title'
     )
+
+
+@admin.register(OutgoingMail)
+class OutgoingMailAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'recipient',
+        'subject',
+        'attempts',
+        'next_attempt',
+        'sent',
+    )
+    search_fields = ('recipient',)
+    list_filter = ('sent',)
+    empty_value_display = '-пусто-'
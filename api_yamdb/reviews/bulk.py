@@ -0,0 +1,143 @@
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import connection, transaction
+from django.db.models import Q
+
+from .models import (Category, CategoryStats, Genre, GenreStats, GenreTitle,
+                     Title)
+from .search import index_titles
+from .stats import change_stats_bulk, defer_genre_links, take_genre_links
+
+SEARCH_FIELDS = {'name', 'description'}
+
+
+def fetch_ids_by_key(model, objs, key):
+    if connection.features.can_return_ids_from_bulk_insert:
+        return
+    ids = dict(model.objects.filter(
+        **{f'{key}__in': [getattr(obj, key) for obj in objs]}
+    ).values_list(key, 'pk'))
+    for obj in objs:
+        obj.pk = ids[getattr(obj, key)]
+
+
+def fetch_new_ids(model, objs):
+    if connection.features.can_return_ids_from_bulk_insert or not objs:
+        return
+    ids = model.objects.order_by('-pk').values_list(
+        'pk', flat=True)[:len(objs)]
+    for obj, pk in zip(objs, reversed(list(ids))):
+        obj.pk = pk
+
+
+def create_folded(model, objs):
+    for obj in objs:
+        obj.fill_folded_fields()
+    model.objects.bulk_create(objs)
+    fetch_ids_by_key(model, objs, 'slug')
+    return objs
+
+
+def create_categories(categories):
+    create_folded(Category, categories)
+    CategoryStats.objects.bulk_create(
+        CategoryStats(category=category) for category in categories)
+    return categories
+
+
+def create_genres(genres):
+    create_folded(Genre, genres)
+    GenreStats.objects.bulk_create(
+        GenreStats(genre=genre) for genre in genres)
+    return genres
+
+
+def stats_deltas():
+    return defaultdict(lambda: [0, 0, 0])
+
+
+def add_delta(deltas, pk, title, sign):
+    if pk is None:
+        return
+    delta = deltas[pk]
+    delta[0] += sign
+    delta[1] += sign * title.rating_sum
+    delta[2] += sign * title.rating_count
+
+
+def create_titles(items):
+    titles = [title for title, _ in items]
+    with transaction.atomic():
+        Title.objects.bulk_create(titles)
+        fetch_new_ids(Title, titles)
+    category_deltas, genre_deltas = stats_deltas(), stats_deltas()
+    links = []
+    for title, genres in items:
+        title._category_origin = title.category_id
+        add_delta(category_deltas, title.category_id, title, 1)
+        for genre in genres:
+            add_delta(genre_deltas, genre.pk, title, 1)
+            links.append(GenreTitle(title=title, genre=genre))
+    GenreTitle.objects.bulk_create(links)
+    change_stats_bulk(CategoryStats.objects, 'category_id', category_deltas)
+    change_stats_bulk(GenreStats.objects, 'genre_id', genre_deltas)
+    index_titles(titles)
+    return titles
+
+
+def update_titles(items):
+    fields = set()
+    category_deltas, genre_deltas = stats_deltas(), stats_deltas()
+    reindex = []
+    genre_changes = {}
+    for title, attrs, genres in items:
+        for name, value in attrs.items():
+            setattr(title, name, value)
+        fields.update(attrs)
+        origin = getattr(title, '_category_origin', title.category_id)
+        if origin != title.category_id:
+            add_delta(category_deltas, origin, title, -1)
+            add_delta(category_deltas, title.category_id, title, 1)
+            title._category_origin = title.category_id
+        if SEARCH_FIELDS.intersection(attrs):
+            reindex.append(title)
+        if genres is not None:
+            genre_changes[title.pk] = (title, genres)
+    if fields:
+        Title.objects.bulk_update([title for title, _, _ in items], fields)
+    replace_genres(genre_changes, genre_deltas)
+    change_stats_bulk(CategoryStats.objects, 'category_id', category_deltas)
+    change_stats_bulk(GenreStats.objects, 'genre_id', genre_deltas)
+    index_titles(reindex, replace=True)
+    return [title for title, _, _ in items]
+
+
+def replace_genres(genre_changes, genre_deltas):
+    current = defaultdict(set)
+    for title_id, genre_id in GenreTitle.objects.filter(
+            title_id__in=genre_changes).values_list('title_id', 'genre_id'):
+        current[title_id].add(genre_id)
+    removed_filters = []
+    removed_links = []
+    links = []
+    for pk, (title, genres) in genre_changes.items():
+        wanted = [genre.pk for genre in genres]
+        removed = current[pk].difference(wanted)
+        if removed:
+            removed_filters.append(Q(title_id=pk, genre_id__in=removed))
+            removed_links += [(pk, genre_id) for genre_id in removed]
+        for genre_id in wanted:
+            if genre_id not in current[pk]:
+                add_delta(genre_deltas, genre_id, title, 1)
+                links.append(GenreTitle(title=title, genre_id=genre_id))
+    if removed_links:
+        defer_genre_links(removed_links)
+        try:
+            GenreTitle.objects.filter(reduce(or_, removed_filters)).delete()
+        finally:
+            removed_links = take_genre_links()
+    for title_id, genre_id in removed_links:
+        add_delta(genre_deltas, genre_id, genre_changes[title_id][0], -1)
+    GenreTitle.objects.bulk_create(links)
@@ -0,0 +1,220 @@
+import csv
+import os
+import random
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from itertools import accumulate
+
+from .importer import IMPORT_ORDER, CsvImporter
+from .models import TODAYS_YEAR, Roles
+
+HEADERS = {
+    'category.csv': ('id', 'name', 'slug'),
+    'genre.csv': ('id', 'name', 'slug'),
+    'titles.csv': ('id', 'name', 'year', 'category', 'description'),
+    'genre_title.csv': ('id', 'title_id', 'genre_id'),
+    'users.csv': ('id', 'username', 'email', 'role', 'bio', 'first_name',
+                  'last_name'),
+    'review.csv': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments.csv': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+WORDS = (
+    'война', 'мир', 'путешествие', 'история', 'любовь', 'город', 'море',
+    'ночь', 'дорога', 'время', 'песня', 'тайна', 'дом', 'небо', 'сердце',
+    'зима', 'лето', 'остров', 'король', 'тень', 'звезда', 'река', 'голос',
+    'последний', 'тихий', 'долгий', 'старый', 'новый', 'тёмный', 'светлый',
+    'хороший', 'отличный', 'скучный', 'сильный', 'смешной', 'грустный',
+    'финал', 'сюжет', 'герой', 'актёр', 'автор', 'музыка', 'книга', 'фильм',
+)
+FIRST_NAMES = ('Анна', 'Иван', 'Мария', 'Пётр', 'Ольга', 'Сергей', 'Елена',
+               'Алексей', 'Наталья', 'Дмитрий')
+LAST_NAMES = ('Иванов', 'Смирнов', 'Кузнецов', 'Попов', 'Васильев',
+              'Петров', 'Соколов', 'Михайлов', 'Новиков', 'Фёдоров')
+FIRST_YEAR = 1900
+PUB_DATE_START = datetime(2015, 1, 1, tzinfo=timezone.utc).timestamp()
+PUB_DATE_SPAN = (datetime(2023, 1, 1, tzinfo=timezone.utc).timestamp()
+                 - PUB_DATE_START)
+ADMIN_EVERY = 10000
+MODERATOR_EVERY = 1000
+REVIEW_WORDS = 12
+COMMENT_WORDS = 6
+TEXT_POOL_SIZE = 4096
+
+GenerateResult = namedtuple('GenerateResult', 'filename rows seconds')
+
+
+def sentence(rng, words):
+    return ' '.join(rng.choices(WORDS, k=words)).capitalize() + '.'
+
+
+def text_pool(rng, words):
+    return [sentence(rng, rng.randint(words // 2, words * 2))
+            for _ in range(TEXT_POOL_SIZE)]
+
+
+def pub_date(rng):
+    return datetime.utcfromtimestamp(
+        PUB_DATE_START + rng.random() * PUB_DATE_SPAN
+    ).isoformat(timespec='milliseconds') + 'Z'
+
+
+class DatasetGenerator:
+
+    def __init__(self, users=1000, titles=1000, reviews=10000,
+                 comments=10000, categories=10, genres=30,
+                 genres_per_title=3, skew=1.0, seed=0):
+        if reviews > users * titles:
+            raise ValueError(
+                'Отзывов больше, чем пар пользователь-произведение')
+        if comments and not reviews:
+            raise ValueError('Для комментариев нужны отзывы')
+        self.users = users
+        self.titles = titles
+        self.reviews = reviews
+        self.comments = comments
+        self.categories = categories
+        self.genres = genres
+        self.genres_per_title = min(genres_per_title, genres)
+        self.skew = skew
+        self.seed = seed
+        self.files = {
+            'category.csv': self.category_rows,
+            'genre.csv': self.genre_rows,
+            'titles.csv': self.title_rows,
+            'genre_title.csv': self.genre_title_rows,
+            'users.csv': self.user_rows,
+            'review.csv': self.review_rows,
+            'comments.csv': self.comment_rows,
+        }
+
+    def random(self, filename):
+        return random.Random(f'{self.seed}:{filename}')
+
+    def rows(self, filename):
+        return self.files[filename]()
+
+    def category_rows(self):
+        for pk in range(1, self.categories + 1):
+            yield pk, f'Категория {pk}', f'category-{pk}'
+
+    def genre_rows(self):
+        for pk in range(1, self.genres + 1):
+            yield pk, f'Жанр {pk}', f'genre-{pk}'
+
+    def title_rows(self):
+        rng = self.random('titles.csv')
+        for pk in range(1, self.titles + 1):
+            name = ' '.join(rng.sample(WORDS, rng.randint(1, 3)))
+            category = (rng.randint(1, self.categories)
+                        if self.categories else '')
+            yield (pk, f'{name.capitalize()} {pk}',
+                   rng.randint(FIRST_YEAR, TODAYS_YEAR), category,
+                   sentence(rng, REVIEW_WORDS))
+
+    def genre_title_rows(self):
+        if not self.genres_per_title:
+            return
+        rng = self.random('genre_title.csv')
+        genres = range(1, self.genres + 1)
+        pk = 0
+        for title in range(1, self.titles + 1):
+            for genre in rng.sample(genres,
+                                    rng.randint(1, self.genres_per_title)):
+                pk += 1
+                yield pk, title, genre
+
+    def user_rows(self):
+        rng = self.random('users.csv')
+        for pk in range(1, self.users + 1):
+            if pk % ADMIN_EVERY == 0:
+                role = Roles.get_admin()
+            elif pk % MODERATOR_EVERY == 0:
+                role = Roles.get_moderator()
+            else:
+                role = Roles.user.value
+            yield (pk, f'user{pk}', f'user{pk}@yamdb.fake', role, '',
+                   rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES))
+
+    def popularity(self, rng):
+        order = list(range(1, self.titles + 1))
+        rng.shuffle(order)
+        weights = list(accumulate(
+            1 / rank ** self.skew for rank in range(1, self.titles + 1)))
+        quality = bytearray(rng.randint(3, 8)
+                            for _ in range(self.titles + 1))
+        return order, weights, quality
+
+    def pick_titles(self, rng, order, weights, count):
+        if count * 2 > self.titles:
+            return rng.sample(order, count)
+        picked = set()
+        while len(picked) < count:
+            picked.update(rng.choices(order, cum_weights=weights,
+                                      k=count - len(picked)))
+        return picked
+
+    def review_rows(self):
+        if not self.reviews:
+            return
+        rng = self.random('review.csv')
+        order, weights, quality = self.popularity(rng)
+        texts = text_pool(rng, REVIEW_WORDS)
+        per_user, extra = divmod(self.reviews, self.users)
+        pk = 0
+        for author in range(1, self.users + 1):
+            count = per_user + (author <= extra)
+            if not count:
+                break
+            for title in self.pick_titles(rng, order, weights, count):
+                pk += 1
+                score = min(10, max(1, quality[title]
+                                    + int(rng.random() * 5) - 1))
+                yield (pk, title, texts[int(rng.random() * TEXT_POOL_SIZE)],
+                       author, score, pub_date(rng))
+
+    def comment_rows(self):
+        rng = self.random('comments.csv')
+        exponent = 1 + self.skew
+        texts = text_pool(rng, COMMENT_WORDS)
+        for pk in range(1, self.comments + 1):
+            review = int(self.reviews * rng.random() ** exponent) + 1
+            author = int(self.users * rng.random()) + 1
+            yield (pk, review, texts[int(rng.random() * TEXT_POOL_SIZE)],
+                   author, pub_date(rng))
+
+    def write_csv(self, path):
+        os.makedirs(path, exist_ok=True)
+        for spec in IMPORT_ORDER:
+            start = time.perf_counter()
+            with open(os.path.join(path, spec.filename), 'w',
+                      encoding='utf-8', newline='') as csv_file:
+                writer = csv.writer(csv_file)
+                writer.writerow(HEADERS[spec.filename])
+                rows = 0
+                for row in self.rows(spec.filename):
+                    writer.writerow(row)
+                    rows += 1
+            yield GenerateResult(spec.filename, rows,
+                                 time.perf_counter() - start)
+
+
+class DatasetImporter(CsvImporter):
+
+    def __init__(self, generator, **kwargs):
+        super().__init__(None, **kwargs)
+        self.generator = generator
+
+    def open_checkpoint(self, spec):
+        return None
+
+    def read_chunks(self, spec):
+        header = HEADERS[spec.filename]
+        batch = []
+        for row in self.generator.rows(spec.filename):
+            batch.append(dict(zip(header, row)))
+            if len(batch) >= self.chunk_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
@@ -0,0 +1,16 @@
+from django.db import transaction
+
+from .models import GenreTitle
+
+
+def set_title_genres(title, genres, created=False):
+    genre_ids = list(dict.fromkeys(genre.pk for genre in genres))
+    current = set() if created else set(GenreTitle.objects.filter(
+        title=title).values_list('genre_id', flat=True))
+    removed = current.difference(genre_ids)
+    added = [pk for pk in genre_ids if pk not in current]
+    with transaction.atomic():
+        if removed:
+            title.genre.remove(*removed)
+        if added:
+            title.genre.add(*added)
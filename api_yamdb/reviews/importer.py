@@ -0,0 +1,335 @@
+import csv
+import hashlib
+import json
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                wait)
+from contextlib import contextmanager
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, transaction
+from django.utils.dateparse import parse_datetime
+
+from .models import (Category, Comment, Genre, GenreTitle, Review, Title,
+                     User, fold_search)
+from .ratings import rebuild_ratings, rebuild_trending
+from .search import rebuild_search_index
+from .stats import rebuild_stats
+
+ImportFile = namedtuple('ImportFile', 'filename model build fields')
+ImportResult = namedtuple(
+    'ImportResult',
+    'filename rows skipped conflicts chunks resumed seconds')
+
+
+class IdMap:
+
+    def __init__(self, ids=()):
+        self._bits = bytearray()
+        for pk in ids:
+            self.add(pk)
+
+    @classmethod
+    def from_model(cls, model):
+        return cls(model.objects.values_list('pk', flat=True).iterator())
+
+    def add(self, pk):
+        index, bit = divmod(pk, 8)
+        if index >= len(self._bits):
+            self._bits.extend(bytes(max(index + 1, 2 * len(self._bits))
+                                    - len(self._bits)))
+        self._bits[index] |= 1 << bit
+
+    def __contains__(self, pk):
+        index, bit = divmod(pk, 8)
+        return index < len(self._bits) and bool(self._bits[index] >> bit & 1)
+
+
+def optional_id(value, id_map):
+    if value and int(value) in id_map:
+        return int(value)
+    return None
+
+
+def build_category(row, maps):
+    return Category(id=int(row['id']), name=row['name'], slug=row['slug'],
+                    name_search=fold_search(row['name']))
+
+
+def build_genre(row, maps):
+    return Genre(id=int(row['id']), name=row['name'], slug=row['slug'],
+                 name_search=fold_search(row['name']))
+
+
+def build_title(row, maps):
+    return Title(id=int(row['id']), name=row['name'], year=int(row['year']),
+                 description=row.get('description', ''),
+                 category_id=optional_id(row['category'], maps[Category]))
+
+
+def build_genre_title(row, maps):
+    title_id = optional_id(row['title_id'], maps[Title])
+    genre_id = optional_id(row['genre_id'], maps[Genre])
+    if title_id is None or genre_id is None:
+        return None
+    return GenreTitle(id=int(row['id']), title_id=title_id, genre_id=genre_id)
+
+
+def build_user(row, maps, password=make_password(None)):
+    return User(id=int(row['id']), username=row['username'],
+                username_search=fold_search(row['username']),
+                email=row['email'], role=row['role'], bio=row['bio'],
+                first_name=row['first_name'], last_name=row['last_name'],
+                password=password)
+
+
+def build_review(row, maps):
+    title_id = optional_id(row['title_id'], maps[Title])
+    author_id = optional_id(row['author'], maps[User])
+    if title_id is None or author_id is None:
+        return None
+    return Review(id=int(row['id']), title_id=title_id, text=row['text'],
+                  author_id=author_id, score=int(row['score']),
+                  pub_date=parse_datetime(row['pub_date']))
+
+
+def build_comment(row, maps):
+    review_id = optional_id(row['review_id'], maps[Review])
+    author_id = optional_id(row['author'], maps[User])
+    if review_id is None or author_id is None:
+        return None
+    return Comment(id=int(row['id']), review_id=review_id, text=row['text'],
+                   author_id=author_id,
+                   pub_date=parse_datetime(row['pub_date']))
+
+
+IMPORT_ORDER = (
+    ImportFile('category.csv', Category, build_category,
+               ('name', 'name_search', 'slug')),
+    ImportFile('genre.csv', Genre, build_genre,
+               ('name', 'name_search', 'slug')),
+    ImportFile('titles.csv', Title, build_title,
+               ('name', 'year', 'description', 'category')),
+    ImportFile('genre_title.csv', GenreTitle, build_genre_title,
+               ('title', 'genre')),
+    ImportFile('users.csv', User, build_user,
+               ('username', 'username_search', 'email', 'role', 'bio',
+                'first_name', 'last_name')),
+    ImportFile('review.csv', Review, build_review,
+               ('title', 'text', 'author', 'score', 'pub_date')),
+    ImportFile('comments.csv', Comment, build_comment,
+               ('review', 'text', 'author', 'pub_date')),
+)
+IMPORT_FILES = {spec.filename: spec for spec in IMPORT_ORDER}
+REFERENCED_MODELS = (Category, Genre, Title, User, Review)
+
+
+@contextmanager
+def preserve_auto_now(model):
+    fields = [field for field in model._meta.concrete_fields
+              if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def read_batches(path, batch_size):
+    with open(path, encoding='utf-8', newline='') as csv_file:
+        batch = []
+        for row in csv.DictReader(csv_file):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def capped_batch_size(model, objects, batch_size):
+    max_batch_size = connection.ops.bulk_batch_size(
+        model._meta.concrete_fields, objects)
+    return max(1, min(batch_size, max_batch_size))
+
+
+def find_existing(model, objects, batch_size):
+    existing = set()
+    for start in range(0, len(objects), batch_size):
+        existing.update(model.objects.filter(
+            pk__in=[obj.pk for obj in objects[start:start + batch_size]]
+        ).values_list('pk', flat=True))
+    return existing
+
+
+def build_objects(filename, rows, maps):
+    spec = IMPORT_FILES[filename]
+    objects = (spec.build(row, maps) for row in rows)
+    return [obj for obj in objects if obj is not None]
+
+
+def write_objects(filename, objects, rows, batch_size, upsert):
+    spec = IMPORT_FILES[filename]
+    batch_size = capped_batch_size(spec.model, objects, batch_size)
+    with preserve_auto_now(spec.model), transaction.atomic():
+        existing = find_existing(spec.model, objects, batch_size)
+        updates = [obj for obj in objects if obj.pk in existing] \
+            if upsert else []
+        new_objects = [obj for obj in objects if obj.pk not in existing]
+        spec.model.objects.bulk_create(
+            new_objects, batch_size=batch_size, ignore_conflicts=True)
+        if updates:
+            spec.model.objects.bulk_update(
+                updates, spec.fields, batch_size=batch_size)
+        inserted = len(find_existing(spec.model, new_objects, batch_size))
+    return rows, rows - len(objects), len(objects) - len(updates) - inserted
+
+
+def import_chunk(filename, rows, maps, batch_size, upsert):
+    return write_objects(filename, build_objects(filename, rows, maps),
+                         len(rows), batch_size, upsert)
+
+
+WORKER_MAPS = {}
+
+
+def init_worker(maps):
+    django.setup()
+    connections.close_all()
+    WORKER_MAPS.update(maps)
+
+
+def build_in_worker(filename, rows):
+    return build_objects(filename, rows, WORKER_MAPS), len(rows)
+
+
+def import_in_worker(filename, rows, batch_size, upsert):
+    return import_chunk(filename, rows, WORKER_MAPS, batch_size, upsert)
+
+
+class Checkpoint:
+
+    def __init__(self, directory, path, chunk_size):
+        stat = os.stat(path)
+        self.stamp = f'{stat.st_size}:{stat.st_mtime_ns}:{chunk_size}'
+        name = hashlib.md5(os.path.abspath(path).encode()).hexdigest()
+        self.path = os.path.join(
+            directory, f'{os.path.basename(path)}.{name}.json')
+        self.done = set()
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as file:
+                state = json.load(file)
+            if state.get('stamp') == self.stamp:
+                self.done = set(state['done'])
+
+    def mark(self, index):
+        self.done.add(index)
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as file:
+            json.dump({'stamp': self.stamp, 'done': sorted(self.done)}, file)
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class CsvImporter:
+
+    def __init__(self, path, batch_size=5000, chunk_size=50000, workers=1,
+                 upsert=False, checkpoint_dir=None):
+        self.path = path
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.upsert = upsert
+        self.checkpoint_dir = checkpoint_dir
+        self.maps = {}
+
+    def run_chunks(self, spec, chunks):
+        if self.workers <= 1:
+            for index, chunk in chunks:
+                yield index, import_chunk(spec.filename, chunk, self.maps,
+                                          self.batch_size, self.upsert)
+            return
+        single_writer = connection.vendor == 'sqlite'
+        connections.close_all()
+        with ProcessPoolExecutor(self.workers, initializer=init_worker,
+                                 initargs=(self.maps,)) as executor:
+            pending = {}
+            for index, chunk in chunks:
+                if single_writer:
+                    future = executor.submit(
+                        build_in_worker, spec.filename, chunk)
+                else:
+                    future = executor.submit(
+                        import_in_worker, spec.filename, chunk,
+                        self.batch_size, self.upsert)
+                pending[future] = index
+                if len(pending) >= 2 * self.workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), self.chunk_result(
+                            spec, future, single_writer)
+            for future in list(pending):
+                yield pending.pop(future), self.chunk_result(
+                    spec, future, single_writer)
+
+    def chunk_result(self, spec, future, single_writer):
+        if not single_writer:
+            return future.result()
+        objects, rows = future.result()
+        return write_objects(spec.filename, objects, rows, self.batch_size,
+                             self.upsert)
+
+    def open_checkpoint(self, spec):
+        if not self.checkpoint_dir:
+            return None
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        return Checkpoint(self.checkpoint_dir,
+                          os.path.join(self.path, spec.filename),
+                          self.chunk_size)
+
+    def read_chunks(self, spec):
+        return read_batches(os.path.join(self.path, spec.filename),
+                            self.chunk_size)
+
+    def import_file(self, spec):
+        start = time.perf_counter()
+        checkpoint = self.open_checkpoint(spec)
+        done = set(checkpoint.done) if checkpoint else set()
+        chunks = (
+            (index, chunk)
+            for index, chunk in enumerate(self.read_chunks(spec))
+            if index not in done)
+        rows = skipped = conflicts = count = 0
+        for index, (chunk_rows, chunk_skipped, chunk_conflicts) in \
+                self.run_chunks(spec, chunks):
+            rows += chunk_rows
+            skipped += chunk_skipped
+            conflicts += chunk_conflicts
+            count += 1
+            if checkpoint:
+                checkpoint.mark(index)
+        if spec.model in REFERENCED_MODELS:
+            self.maps[spec.model] = IdMap.from_model(spec.model)
+        return ImportResult(spec.filename, rows, skipped, conflicts, count,
+                            len(done), time.perf_counter() - start), checkpoint
+
+    def run(self):
+        checkpoints = []
+        for spec in IMPORT_ORDER:
+            result, checkpoint = self.import_file(spec)
+            checkpoints.append(checkpoint)
+            yield result
+        rebuild_ratings()
+        rebuild_trending()
+        rebuild_search_index()
+        rebuild_stats()
+        for checkpoint in filter(None, checkpoints):
+            checkpoint.clear()
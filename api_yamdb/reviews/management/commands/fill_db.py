@@ -1,51 +1,54 @@
-import csv
 import os
 
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
-from reviews.models import (Category, Comment, Genre, GenreTitle,
-                            Review, Title, User)
+from reviews.importer import CsvImporter
 
 
 class Command(BaseCommand):
     help = 'Заполнение БД тестовыми данными'
 
-    csv_model = {
-        'category.csv':
-            (Category.objects.get_or_create, 'dict(name=row[1], slug=row[2])'),
-        'genre.csv':
-            (Genre.objects.get_or_create, 'dict(name=row[1], slug=row[2])'),
-        'titles.csv':
-            (Title.objects.get_or_create,
-             'dict(name=row[1], year=row[2] ,'
-             'category=Category.objects.get(pk=row[3]))'),
-        'genre_title.csv':
-            (GenreTitle.objects.get_or_create,
-             'dict(title_id=row[1], genre_id=row[2])'),
-        'users.csv':
-            (User.objects.get_or_create,
-             'dict(id=row[0], username=row[1], email=row[2], role=row[3] ,'
-             'bio=row[4], first_name=row[5], last_name=row[6])'),
-        'review.csv':
-            (Review.objects.get_or_create,
-             'dict(title_id=row[1], text=row[2], '
-             'author=User.objects.get(id=row[3]), score=row[4])'),
-        'comments.csv':
-            (Comment.objects.get_or_create,
-             'dict(review_id=row[1], text=row[2], '
-             'author=User.objects.get(id=row[3]))'),
-    }
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Каталог с CSV-файлами')
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Количество строк в одном INSERT')
+        parser.add_argument(
+            '--chunk-size', type=int, default=50000,
+            help='Количество строк в одной транзакции')
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Количество процессов для параллельной загрузки; на SQLite '
+                 'процессы только готовят строки, а пишет один процесс')
+        parser.add_argument(
+            '--checkpoint-dir',
+            help='Каталог контрольных точек для возобновления загрузки')
+        parser.add_argument(
+            '--upsert', action='store_true',
+            help='Обновлять существующие строки по первичному ключу')
 
     def handle(self, *args, **kwargs):
-        os.chdir(os.path.join('static', 'data'))
-        for key in self.csv_model:
-            with open(key, encoding='utf-8') as r_file:
-                file_reader = csv.reader(r_file, delimiter=',')
-                count = 0
-                for row in file_reader:
-                    if count == 0:
-                        pass
-                    else:
-                        self.csv_model[key][0](**eval(self.csv_model[key][1]))
-                    count += 1
-                print(f'{key} содержит {count} строк.')
+        importer = CsvImporter(
+            kwargs['path'], batch_size=kwargs['batch_size'],
+            chunk_size=kwargs['chunk_size'], workers=kwargs['workers'],
+            upsert=kwargs['upsert'],
+            checkpoint_dir=kwargs['checkpoint_dir'])
+        total_rows = total_seconds = 0
+        for result in importer.run():
+            rate = result.rows / result.seconds if result.seconds else 0
+            total_rows += result.rows
+            total_seconds += result.seconds
+            self.stdout.write(
+                f'{result.filename} содержит {result.rows} строк, '
+                f'пропущено {result.skipped}, '
+                f'уже было в БД {result.conflicts}, частей {result.chunks}, '
+                f'восстановлено из контрольной точки {result.resumed}, '
+                f'{rate:.0f} строк/с.')
+        rate = total_rows / total_seconds if total_seconds else 0
+        self.stdout.write(
+            f'Итого {total_rows} строк за {total_seconds:.1f} с, '
+            f'{rate:.0f} строк/с.')
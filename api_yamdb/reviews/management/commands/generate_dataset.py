@@ -0,0 +1,74 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from reviews.dataset import DatasetGenerator, DatasetImporter
+
+
+class Command(BaseCommand):
+    help = 'Генерация синтетического набора данных для нагрузочных тестов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000,
+                            help='Количество пользователей')
+        parser.add_argument('--titles', type=int, default=1000,
+                            help='Количество произведений')
+        parser.add_argument('--reviews', type=int, default=10000,
+                            help='Количество отзывов')
+        parser.add_argument('--comments', type=int, default=10000,
+                            help='Количество комментариев')
+        parser.add_argument('--categories', type=int, default=10,
+                            help='Количество категорий')
+        parser.add_argument('--genres', type=int, default=30,
+                            help='Количество жанров')
+        parser.add_argument('--genres-per-title', type=int, default=3,
+                            help='Наибольшее число жанров у произведения')
+        parser.add_argument(
+            '--skew', type=float, default=1.0,
+            help='Показатель закона Ципфа для популярности произведений')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='Зерно генератора случайных чисел')
+        parser.add_argument(
+            '--output',
+            help='Каталог для CSV-файлов в формате fill_db; без него '
+                 'данные пишутся прямо в БД')
+        parser.add_argument(
+            '--batch-size', type=int, default=5000,
+            help='Количество строк в одном INSERT')
+        parser.add_argument(
+            '--chunk-size', type=int, default=50000,
+            help='Количество строк в одной транзакции')
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help='Количество процессов для параллельной загрузки; на SQLite '
+                 'процессы только готовят строки, а пишет один процесс')
+
+    def handle(self, *args, **kwargs):
+        try:
+            generator = DatasetGenerator(
+                users=kwargs['users'], titles=kwargs['titles'],
+                reviews=kwargs['reviews'], comments=kwargs['comments'],
+                categories=kwargs['categories'], genres=kwargs['genres'],
+                genres_per_title=kwargs['genres_per_title'],
+                skew=kwargs['skew'], seed=kwargs['seed'])
+        except ValueError as error:
+            raise CommandError(error)
+        if kwargs['output']:
+            results = generator.write_csv(kwargs['output'])
+        else:
+            results = DatasetImporter(
+                generator, batch_size=kwargs['batch_size'],
+                chunk_size=kwargs['chunk_size'],
+                workers=kwargs['workers']).run()
+        total_rows = total_seconds = 0
+        for result in results:
+            rate = result.rows / result.seconds if result.seconds else 0
+            total_rows += result.rows
+            total_seconds += result.seconds
+            conflicts = getattr(result, 'conflicts', 0)
+            self.stdout.write(
+                f'{result.filename}: {result.rows} строк, '
+                + (f'уже было в БД {conflicts}, ' if conflicts else '')
+                + f'{rate:.0f} строк/с.')
+        rate = total_rows / total_seconds if total_seconds else 0
+        self.stdout.write(
+            f'Итого {total_rows} строк за {total_seconds:.1f} с, '
+            f'{rate:.0f} строк/с.')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviews.ratings import rebuild_ratings
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт сохранённых рейтингов произведений по отзывам'
+
+    def handle(self, *args, **kwargs):
+        count = rebuild_ratings()
+        self.stdout.write(f'Пересчитан рейтинг {count} произведений.')
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from reviews.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Перестроение поискового индекса произведений'
+
+    def handle(self, *args, **kwargs):
+        count = rebuild_search_index()
+        self.stdout.write(f'Проиндексировано {count} произведений.')
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from reviews.stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт статистики жанров и категорий'
+
+    def handle(self, *args, **kwargs):
+        categories, genres = rebuild_stats()
+        self.stdout.write(
+            f'Пересчитана статистика {categories} категорий '
+            f'и {genres} жанров.')
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from reviews.ratings import rebuild_ratings, rebuild_trending
+
+
+class Command(BaseCommand):
+    help = 'Пересчёт рейтинга и популярности произведений по отзывам'
+
+    def handle(self, *args, **kwargs):
+        rated = rebuild_ratings()
+        trending = rebuild_trending()
+        self.stdout.write(
+            f'Пересчитан рейтинг {rated} произведений, '
+            f'популярность {trending} произведений.')
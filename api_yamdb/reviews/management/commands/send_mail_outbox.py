@@ -0,0 +1,49 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.outbox import deliver_batch, get_outbox_settings, pending_mail
+
+
+class Command(BaseCommand):
+    help = 'Отправка писем из очереди исходящей почты'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            help='Количество писем, отправляемых через одно соединение')
+        parser.add_argument(
+            '--max-attempts', type=int,
+            help='Количество попыток отправки одного письма')
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Пауза в секундах, когда очередь пуста')
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Разобрать очередь и завершить работу')
+
+    def handle(self, *args, **kwargs):
+        max_attempts = (kwargs['max_attempts']
+                        or get_outbox_settings().get('MAX_ATTEMPTS', 5))
+        total_sent = total_deferred = total_dropped = 0
+        total_seconds = 0
+        while True:
+            result = deliver_batch(kwargs['batch_size'], max_attempts)
+            if not any(result[:3]):
+                if kwargs['once']:
+                    break
+                time.sleep(kwargs['interval'])
+                continue
+            total_sent += result.sent
+            total_deferred += result.deferred
+            total_dropped += result.dropped
+            total_seconds += result.seconds
+            rate = result.sent / result.seconds if result.seconds else 0
+            self.stdout.write(
+                f'Отправлено {result.sent}, отложено {result.deferred}, '
+                f'отброшено {result.dropped}, {rate:.0f} писем/с.')
+        rate = total_sent / total_seconds if total_seconds else 0
+        self.stdout.write(
+            f'Итого отправлено {total_sent}, отложено {total_deferred}, '
+            f'отброшено {total_dropped}, {rate:.0f} писем/с, '
+            f'в очереди {pending_mail(max_attempts).count()}.')
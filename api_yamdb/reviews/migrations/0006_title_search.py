@@ -0,0 +1,118 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:30
+
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import OperationalError, migrations, models, transaction
+import django.db.models.deletion
+
+FTS_TABLE = 'reviews_title_fts'
+NAME_WEIGHT = 5
+DESCRIPTION_WEIGHT = 1
+TOKEN_LENGTH = 64
+TOKEN_RE = re.compile(r'\w+')
+BATCH_SIZE = 1000
+
+
+def _tokenize(text):
+    text = unicodedata.normalize('NFKD', (text or '').casefold())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return [token[:TOKEN_LENGTH] for token in TOKEN_RE.findall(text)]
+
+
+def _search_text(text):
+    return ' '.join(_tokenize(text))
+
+
+def _build_tokens(name, description):
+    weights = Counter()
+    for token in _tokenize(name):
+        weights[token] += NAME_WEIGHT
+    for token in _tokenize(description):
+        weights[token] += DESCRIPTION_WEIGHT
+    return weights
+
+
+def _title_rows(apps):
+    Title = apps.get_model('reviews', 'Title')
+    return Title.objects.order_by().values_list(
+        'id', 'name', 'description').iterator(chunk_size=BATCH_SIZE)
+
+
+def _write_rows(cursor, fts, token_model, rows):
+    if not rows:
+        return
+    if fts:
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE}(rowid, name, description) '
+            f'VALUES (%s, %s, %s)', rows)
+    else:
+        token_model.objects.bulk_create(rows)
+
+
+def fill_search_index(apps, connection, fts):
+    TitleSearchToken = apps.get_model('reviews', 'TitleSearchToken')
+    rows = []
+    with connection.cursor() as cursor:
+        for title_id, name, description in _title_rows(apps):
+            if fts:
+                rows.append(
+                    (title_id, _search_text(name), _search_text(description)))
+            else:
+                rows.extend(
+                    TitleSearchToken(title_id=title_id, token=token,
+                                     weight=weight)
+                    for token, weight in _build_tokens(
+                        name, description).items())
+            if len(rows) >= BATCH_SIZE:
+                _write_rows(cursor, fts, TitleSearchToken, rows)
+                rows = []
+        _write_rows(cursor, fts, TitleSearchToken, rows)
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    fts = connection.vendor == 'sqlite'
+    if fts:
+        try:
+            with transaction.atomic(using=connection.alias):
+                schema_editor.execute(
+                    f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+                    f'name, description)')
+        except OperationalError:
+            fts = False
+    fill_search_index(apps, connection, fts)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_outgoing_mail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleSearchToken',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField()),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='reviews.Title')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='titlesearchtoken',
+            index=models.Index(fields=['token', 'title'], name='title_token_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='titlesearchtoken',
+            constraint=models.UniqueConstraint(fields=('title', 'token'), name='unique_title_token'),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
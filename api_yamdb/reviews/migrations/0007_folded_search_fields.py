@@ -0,0 +1,54 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:36
+
+import unicodedata
+
+from django.db import migrations, models
+
+FOLDED_FIELDS = (
+    ('Category', 'name_search', 'name'),
+    ('Genre', 'name_search', 'name'),
+    ('User', 'username_search', 'username'),
+)
+BATCH_SIZE = 1000
+
+
+def fill_folded_fields(apps, schema_editor):
+    for model_name, target, source in FOLDED_FIELDS:
+        model = apps.get_model('reviews', model_name)
+        batch = []
+        rows = model.objects.order_by('id').values_list('id', source)
+        for pk, value in rows.iterator(chunk_size=BATCH_SIZE):
+            batch.append(model(id=pk, **{target: unicodedata.normalize(
+                'NFKC', value).casefold()}))
+            if len(batch) >= BATCH_SIZE:
+                model.objects.bulk_update(batch, (target,))
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, (target,))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='name_search',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256),
+        ),
+        migrations.AddField(
+            model_name='genre',
+            name='name_search',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=256),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='username_search',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150),
+        ),
+        migrations.RunPython(fill_folded_fields,
+                             migrations.RunPython.noop),
+    ]
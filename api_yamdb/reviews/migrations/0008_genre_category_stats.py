@@ -0,0 +1,64 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:38
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+import django.db.models.deletion
+import reviews.models
+
+
+def fill_stats(apps, schema_editor):
+    for model_name, stats_name, field, path in (
+            ('Category', 'CategoryStats', 'category', 'titles'),
+            ('Genre', 'GenreStats', 'genre', 'titles__title')):
+        model = apps.get_model('reviews', model_name)
+        stats = apps.get_model('reviews', stats_name)
+        rows = model.objects.annotate(
+            total_titles=Count('titles'),
+            total_sum=Coalesce(Sum(f'{path}__rating_sum'), 0),
+            total_count=Coalesce(Sum(f'{path}__rating_count'), 0))
+        stats.objects.bulk_create(
+            stats(**{f'{field}_id': row.id},
+                  title_count=row.total_titles,
+                  rating_sum=row.total_sum,
+                  rating_count=row.total_count)
+            for row in rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_folded_search_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.Category')),
+                ('title_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Статистика категории',
+                'verbose_name_plural': 'Статистика категорий',
+            },
+            bases=(reviews.models.StatsMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name='GenreStats',
+            fields=[
+                ('genre', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='reviews.Genre')),
+                ('title_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Статистика жанра',
+                'verbose_name_plural': 'Статистика жанров',
+            },
+            bases=(reviews.models.StatsMixin, models.Model),
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
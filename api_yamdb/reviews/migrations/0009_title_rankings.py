@@ -0,0 +1,63 @@
+# Generated by Django 2.2.16 on 2026-10-18 20:42
+
+import math
+from datetime import datetime, timezone
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import migrations, models
+
+TRENDING_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def _trending_weight(score, pub_date):
+    days = (pub_date - TRENDING_EPOCH).total_seconds() / 86400
+    half_life = getattr(settings, 'TRENDING_HALF_LIFE_DAYS', 7)
+    return math.log(score) + math.log(2) * days / half_life
+
+
+def _log_sum(weights):
+    top = max(weights)
+    return top + math.log(sum(math.exp(weight - top) for weight in weights))
+
+
+def fill_trending(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    Title = apps.get_model('reviews', 'Title')
+    reviews = Review.objects.order_by('title_id').values_list(
+        'title_id', 'score', 'pub_date')
+    Title.objects.bulk_update(
+        [Title(id=title_id, trending=_log_sum(
+            [_trending_weight(score, pub_date)
+             for _, score, pub_date in rows]))
+         for title_id, rows in groupby(reviews.iterator(), itemgetter(0))],
+        ('trending',), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_genre_category_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='trending',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-rating', 'id'], name='title_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-rating', 'id'], name='title_category_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['-trending', 'id'], name='title_trending_idx'),
+        ),
+        migrations.RunPython(fill_trending, migrations.RunPython.noop),
+    ]
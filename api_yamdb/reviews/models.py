@@ -1,38 +1,69 @@
 import datetime as dt
+import unicodedata
 from enum import Enum
 
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import (MaxValueValidator, MinValueValidator,
                                     RegexValidator)
 from django.db import models
+from django.utils import timezone
 
 QUATERNARY_GEOLOGICAL_PERIOD = -2588000
 TODAYS_YEAR = dt.date.today().year
 MAX_SCORE = 10
 MIN_SCORE = 1
+TOKEN_CLAIM_FIELDS = ('username', 'role', 'is_staff', 'is_active')
 
 
-class Category(models.Model):
+def fold_search(value):
+    return unicodedata.normalize('NFKC', value or '').casefold()
+
+
+class FoldedFieldsMixin:
+    folded_fields = {}
+
+    def fill_folded_fields(self):
+        for target, source in self.folded_fields.items():
+            setattr(self, target, fold_search(getattr(self, source)))
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        self.fill_folded_fields()
+        for target, source in self.folded_fields.items():
+            if update_fields is not None and source in update_fields:
+                kwargs['update_fields'] = {*kwargs['update_fields'], target}
+        super().save(*args, **kwargs)
+
+
+class Category(FoldedFieldsMixin, models.Model):
     name = models.CharField(max_length=256)
+    name_search = models.CharField(max_length=256, db_index=True,
+                                   default='', editable=False)
     slug = models.SlugField(max_length=50,
                             unique=True,
                             validators=[RegexValidator(
                                 regex=r'^[-a-zA-Z0-9_]+$',
                                 message='Ошибка валидации поля slug')])
 
+    folded_fields = {'name_search': 'name'}
+
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
 
 
-class Genre(models.Model):
+class Genre(FoldedFieldsMixin, models.Model):
     name = models.CharField(max_length=256)
+    name_search = models.CharField(max_length=256, db_index=True,
+                                   default='', editable=False)
     slug = models.SlugField(max_length=50,
                             unique=True,
                             validators=[RegexValidator(
                                 regex=r'^[-a-zA-Z0-9_]+$',
                                 message='Ошибка валидации поля slug')])
 
+    folded_fields = {'name_search': 'name'}
+
     class Meta:
         verbose_name = 'Жанр'
         verbose_name_plural = 'Жанры'
@@ -55,6 +86,97 @@ class Title(models.Model):
         related_name='titles',
         blank=True,
         null=True, )
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating = models.FloatField(blank=True, null=True, editable=False)
+    trending = models.FloatField(blank=True, null=True, editable=False)
+
+    aggregate_fields = ('rating_sum', 'rating_count', 'rating', 'trending')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=('category', 'year'),
+                         name='title_category_year_idx'),
+            models.Index(fields=('-rating', 'id'),
+                         name='title_rating_idx'),
+            models.Index(fields=('category', '-rating', 'id'),
+                         name='title_category_rating_idx'),
+            models.Index(fields=('-trending', 'id'),
+                         name='title_trending_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if 'category_id' in loaded:
+            instance._category_origin = loaded['category_id']
+        return instance
+
+    def save(self, *args, **kwargs):
+        if (not self._state.adding and not args
+                and kwargs.get('update_fields') is None
+                and not kwargs.get('force_insert')):
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.aggregate_fields]
+        super().save(*args, **kwargs)
+
+
+class StatsMixin:
+
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 2)
+
+
+class CategoryStats(StatsMixin, models.Model):
+    category = models.OneToOneField(Category,
+                                    primary_key=True,
+                                    related_name='stats',
+                                    on_delete=models.CASCADE)
+    title_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Статистика категории'
+        verbose_name_plural = 'Статистика категорий'
+
+
+class GenreStats(StatsMixin, models.Model):
+    genre = models.OneToOneField(Genre,
+                                 primary_key=True,
+                                 related_name='stats',
+                                 on_delete=models.CASCADE)
+    title_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Статистика жанра'
+        verbose_name_plural = 'Статистика жанров'
+
+
+class TitleSearchToken(models.Model):
+    title = models.ForeignKey(Title,
+                              related_name='search_tokens',
+                              on_delete=models.CASCADE)
+    token = models.CharField(max_length=64)
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=('title', 'token'),
+                                    name='unique_title_token'),
+        ]
+        indexes = [
+            models.Index(fields=('token', 'title'),
+                         name='title_token_idx'),
+        ]
 
 
 class GenreTitle(models.Model):
@@ -86,7 +208,7 @@ class Roles(Enum):
         return max(len(i.value) for i in cls)
 
 
-class User(AbstractUser):
+class User(FoldedFieldsMixin, AbstractUser):
     username = models.CharField(max_length=150,
                                 unique=True,
                                 validators=[RegexValidator(
@@ -99,6 +221,11 @@ class User(AbstractUser):
     role = models.CharField(max_length=Roles.max_len_choices(),
                             choices=Roles.choices(),
                             default='user', verbose_name='role')
+    token_version = models.PositiveIntegerField(default=0, editable=False)
+    username_search = models.CharField(max_length=150, db_index=True,
+                                       default='', editable=False)
+
+    folded_fields = {'username_search': 'username'}
 
     @property
     def is_admin(self):
@@ -148,11 +275,23 @@ class Review(models.Model):
                 fields=('author', 'title'),
                 name='unique_review'
             )]
+        indexes = [
+            models.Index(fields=('title', '-pub_date'),
+                         name='review_title_pub_date_idx'),
+        ]
         ordering = ('-pub_date',)
 
     def __str__(self):
         return self.text
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if 'title_id' in loaded and 'score' in loaded:
+            instance._rating_origin = (loaded['title_id'], loaded['score'])
+        return instance
+
 
 class Comment(models.Model):
     review = models.ForeignKey(
@@ -180,9 +319,42 @@ class Comment(models.Model):
     )
 
     class Meta:
+        indexes = [
+            models.Index(fields=('review', '-pub_date'),
+                         name='comment_review_pub_date_idx'),
+        ]
         ordering = ['-pub_date']
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
 
     def __str__(self):
         return self.text
+
+
+class OutgoingMail(models.Model):
+    subject = models.CharField(max_length=255, verbose_name='Тема')
+    message = models.TextField(verbose_name='Текст письма')
+    from_email = models.CharField(max_length=254, verbose_name='Отправитель')
+    recipient = models.EmailField(max_length=254, verbose_name='Получатель')
+    created = models.DateTimeField(auto_now_add=True,
+                                   verbose_name='Дата постановки в очередь')
+    next_attempt = models.DateTimeField(default=timezone.now,
+                                        verbose_name='Следующая попытка')
+    attempts = models.PositiveSmallIntegerField(default=0,
+                                                verbose_name='Попыток')
+    last_error = models.TextField(blank=True,
+                                  verbose_name='Последняя ошибка')
+    sent = models.DateTimeField(null=True, blank=True,
+                                verbose_name='Дата отправки')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=('sent', 'next_attempt'),
+                         name='outgoing_mail_queue_idx'),
+        ]
+        ordering = ['next_attempt']
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,93 @@
+import time
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingMail
+
+DeliveryResult = namedtuple('DeliveryResult',
+                            'sent deferred dropped seconds')
+
+
+def get_outbox_settings():
+    return getattr(settings, 'MAIL_OUTBOX', {})
+
+
+def enqueue_mail(subject, message, from_email, recipient):
+    return OutgoingMail.objects.create(
+        subject=subject, message=message,
+        from_email=from_email, recipient=recipient)
+
+
+def pending_mail(max_attempts):
+    return OutgoingMail.objects.filter(
+        sent__isnull=True, attempts__lt=max_attempts)
+
+
+def claim_batch(batch_size, max_attempts, lease):
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            pending_mail(max_attempts)
+            .filter(next_attempt__lte=now)
+            .select_for_update(skip_locked=True)
+            .order_by('next_attempt', 'id')[:batch_size])
+        OutgoingMail.objects.filter(
+            id__in=[mail.id for mail in batch]
+        ).update(next_attempt=now + timedelta(seconds=lease))
+    return batch
+
+
+def retry_delay(attempts, backoff, max_backoff):
+    return min(backoff * 2 ** (attempts - 1), max_backoff)
+
+
+def record_failure(mail, error, backoff, max_backoff):
+    mail.attempts += 1
+    mail.last_error = f'{type(error).__name__}: {error}'
+    mail.next_attempt = timezone.now() + timedelta(
+        seconds=retry_delay(mail.attempts, backoff, max_backoff))
+
+
+def deliver_batch(batch_size=None, max_attempts=None):
+    config = get_outbox_settings()
+    batch_size = batch_size or config.get('BATCH_SIZE', 100)
+    max_attempts = max_attempts or config.get('MAX_ATTEMPTS', 5)
+    backoff = config.get('BACKOFF', 60)
+    max_backoff = config.get('MAX_BACKOFF', 3600)
+    started = time.perf_counter()
+    batch = claim_batch(batch_size, max_attempts, config.get('LEASE', 300))
+    if not batch:
+        return DeliveryResult(0, 0, 0, 0)
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for mail in batch:
+            record_failure(mail, error, backoff, max_backoff)
+    else:
+        try:
+            for mail in batch:
+                try:
+                    EmailMessage(
+                        subject=mail.subject, body=mail.message,
+                        from_email=mail.from_email, to=[mail.recipient],
+                        connection=connection).send()
+                except Exception as error:
+                    record_failure(mail, error, backoff, max_backoff)
+                else:
+                    mail.attempts += 1
+                    mail.sent = timezone.now()
+        finally:
+            connection.close()
+    OutgoingMail.objects.bulk_update(
+        batch, ('attempts', 'last_error', 'next_attempt', 'sent'))
+    sent = sum(mail.sent is not None for mail in batch)
+    dropped = sum(mail.sent is None and mail.attempts >= max_attempts
+                  for mail in batch)
+    return DeliveryResult(sent, len(batch) - sent - dropped, dropped,
+                          time.perf_counter() - started)
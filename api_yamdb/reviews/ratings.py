@@ -0,0 +1,105 @@
+import math
+from datetime import datetime, timezone
+from itertools import groupby
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (Avg, Case, Count, ExpressionWrapper, F,
+                              FloatField, OuterRef, Q, Subquery, Sum, Value,
+                              When)
+from django.db.models.functions import Abs, Cast, Coalesce, Exp, Greatest, Ln
+
+from .models import Review, Title
+
+TRENDING_EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+TRENDING_PRECISION = 1e-9
+TRENDING_BATCH_SIZE = 1000
+
+
+def trending_weight(score, pub_date):
+    days = (pub_date - TRENDING_EPOCH).total_seconds() / 86400
+    half_life = getattr(settings, 'TRENDING_HALF_LIFE_DAYS', 7)
+    return math.log(score) + math.log(2) * days / half_life
+
+
+def add_trending(weight):
+    return Case(
+        When(trending__isnull=True, then=Value(weight)),
+        default=Greatest(F('trending'), Value(weight)) + Ln(
+            1 + Exp(-Abs(F('trending') - weight))),
+        output_field=FloatField())
+
+
+def remove_trending(weight):
+    return Case(
+        When(Q(trending__isnull=True)
+             | Q(trending__lte=weight + TRENDING_PRECISION),
+             then=Value(None)),
+        default=F('trending') + Ln(1 - Exp(weight - F('trending'))),
+        output_field=FloatField())
+
+
+def rescore_trending(weight, ratio):
+    return Case(
+        When(trending__isnull=True, then=Value(None)),
+        default=F('trending') + Ln(
+            1 + Exp(weight - F('trending')) * (ratio - 1)),
+        output_field=FloatField())
+
+
+def change_rating(title_id, score_delta, count_delta, trending=None):
+    rating_sum = F('rating_sum') + score_delta
+    rating_count = F('rating_count') + count_delta
+    extra = {} if trending is None else {'trending': trending}
+    return Title.objects.filter(pk=title_id).update(
+        rating_sum=rating_sum,
+        rating_count=rating_count,
+        rating=Case(
+            When(rating_count__lte=-count_delta, then=Value(None)),
+            default=ExpressionWrapper(
+                Cast(rating_sum, FloatField()) / rating_count,
+                output_field=FloatField()),
+            output_field=FloatField()),
+        **extra)
+
+
+def rebuild_ratings(titles=None):
+    if titles is None:
+        titles = Title.objects.all()
+    reviews = Review.objects.filter(
+        title=OuterRef('pk')).order_by().values('title')
+    return titles.update(
+        rating_sum=Coalesce(
+            Subquery(reviews.annotate(total=Sum('score')).values('total')),
+            0),
+        rating_count=Coalesce(
+            Subquery(reviews.annotate(total=Count('id')).values('total')),
+            0),
+        rating=Subquery(
+            reviews.annotate(total=Avg('score')).values('total'),
+            output_field=FloatField()))
+
+
+def log_sum(weights):
+    top = max(weights)
+    return top + math.log(sum(math.exp(weight - top) for weight in weights))
+
+
+def rebuild_trending():
+    reviews = Review.objects.order_by('title_id').values_list(
+        'title_id', 'score', 'pub_date')
+    count = 0
+    batch = []
+    with transaction.atomic():
+        Title.objects.update(trending=None)
+        for title_id, rows in groupby(reviews.iterator(), itemgetter(0)):
+            batch.append(Title(id=title_id, trending=log_sum(
+                [trending_weight(score, pub_date)
+                 for _, score, pub_date in rows])))
+            count += 1
+            if len(batch) >= TRENDING_BATCH_SIZE:
+                Title.objects.bulk_update(batch, ('trending',))
+                batch = []
+        Title.objects.bulk_update(batch, ('trending',))
+    return count
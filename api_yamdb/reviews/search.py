@@ -0,0 +1,163 @@
+import re
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import (Count, IntegerField, OuterRef, Subquery,
+                              Sum)
+
+from .models import Title, TitleSearchToken
+
+FTS_TABLE = 'reviews_title_fts'
+NAME_WEIGHT = 5
+DESCRIPTION_WEIGHT = 1
+TOKEN_LENGTH = 64
+REBUILD_BATCH_SIZE = 5000
+TOKEN_RE = re.compile(r'\w+')
+
+_fts_tables = {}
+
+
+def tokenize(text):
+    text = unicodedata.normalize('NFKD', (text or '').casefold())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return [token[:TOKEN_LENGTH] for token in TOKEN_RE.findall(text)]
+
+
+def search_text(text):
+    return ' '.join(tokenize(text))
+
+
+def build_tokens(name, description):
+    weights = Counter()
+    for token in tokenize(name):
+        weights[token] += NAME_WEIGHT
+    for token in tokenize(description):
+        weights[token] += DESCRIPTION_WEIGHT
+    return weights
+
+
+def use_fts():
+    if getattr(settings, 'TITLE_SEARCH_BACKEND', 'auto') != 'auto':
+        return False
+    if connection.vendor != 'sqlite':
+        return False
+    name = connection.settings_dict['NAME']
+    if name not in _fts_tables:
+        _fts_tables[name] = (
+            FTS_TABLE in connection.introspection.table_names())
+    return _fts_tables[name]
+
+
+def index_title(title):
+    if use_fts():
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [title.id])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE}(rowid, name, description) '
+                f'VALUES (%s, %s, %s)',
+                [title.id, search_text(title.name),
+                 search_text(title.description)])
+        return
+    with transaction.atomic():
+        TitleSearchToken.objects.filter(title_id=title.id).delete()
+        TitleSearchToken.objects.bulk_create(
+            TitleSearchToken(title_id=title.id, token=token, weight=weight)
+            for token, weight in build_tokens(
+                title.name, title.description).items())
+
+
+def index_titles(titles, replace=False):
+    if not titles:
+        return
+    fts = use_fts()
+    ids = [title.id for title in titles]
+    with transaction.atomic(), connection.cursor() as cursor:
+        if fts:
+            if replace:
+                cursor.execute(
+                    f'DELETE FROM {FTS_TABLE} WHERE rowid IN '
+                    f'({", ".join(["%s"] * len(ids))})', ids)
+            rows = [(title.id, search_text(title.name),
+                     search_text(title.description)) for title in titles]
+        else:
+            if replace:
+                TitleSearchToken.objects.filter(title_id__in=ids).delete()
+            rows = [TitleSearchToken(title_id=title.id, token=token,
+                                     weight=weight)
+                    for title in titles
+                    for token, weight in build_tokens(
+                        title.name, title.description).items()]
+        write_index_rows(cursor, fts, rows)
+
+
+def unindex_title(title_id):
+    if use_fts():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [title_id])
+
+
+def rebuild_search_index():
+    count = 0
+    rows = []
+    titles = Title.objects.order_by().values_list(
+        'id', 'name', 'description')
+    fts = use_fts()
+    with transaction.atomic(), connection.cursor() as cursor:
+        if fts:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        else:
+            TitleSearchToken.objects.all().delete()
+        for title_id, name, description in titles.iterator():
+            if fts:
+                rows.append(
+                    (title_id, search_text(name), search_text(description)))
+            else:
+                rows.extend(
+                    TitleSearchToken(title_id=title_id, token=token,
+                                     weight=weight)
+                    for token, weight in build_tokens(
+                        name, description).items())
+            count += 1
+            if len(rows) >= REBUILD_BATCH_SIZE:
+                write_index_rows(cursor, fts, rows)
+                rows = []
+        write_index_rows(cursor, fts, rows)
+    return count
+
+
+def write_index_rows(cursor, fts, rows):
+    if not fts:
+        TitleSearchToken.objects.bulk_create(rows)
+    elif rows:
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE}(rowid, name, description) '
+            f'VALUES (%s, %s, %s)', rows)
+
+
+def search_titles(queryset, query):
+    tokens = set(tokenize(query))
+    if not tokens:
+        return queryset.none()
+    if use_fts():
+        table = queryset.model._meta.db_table
+        return queryset.extra(
+            select={'search_rank': f'bm25({FTS_TABLE}, %s, %s)'},
+            select_params=(NAME_WEIGHT, DESCRIPTION_WEIGHT),
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = {table}.id',
+                   f'{FTS_TABLE} MATCH %s'],
+            params=[' '.join(f'"{token}"' for token in sorted(tokens))],
+        ).order_by('search_rank', 'id')
+    matches = TitleSearchToken.objects.filter(
+        token__in=tokens).order_by().values('title')
+    ranks = matches.filter(title=OuterRef('pk')).annotate(
+        rank=Sum('weight')).values('rank')
+    found = matches.annotate(hits=Count('token')).filter(
+        hits=len(tokens)).values('title')
+    return queryset.filter(id__in=found).annotate(
+        search_rank=Subquery(ranks, output_field=IntegerField()),
+    ).order_by('-search_rank', 'id')
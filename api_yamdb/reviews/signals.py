@@ -0,0 +1,143 @@
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete, pre_save)
+from django.dispatch import receiver
+
+from .models import (Category, CategoryStats, Genre, GenreStats, GenreTitle,
+                     Review, Title)
+from .ratings import (add_trending, change_rating, remove_trending,
+                      rescore_trending, trending_weight)
+from .search import index_title, unindex_title
+from .stats import (change_genre_titles, change_review_stats, defer_genre_link,
+                    defer_genre_links, deleting_titles, move_title,
+                    remove_title, take_genre_links)
+
+
+def change_review_totals(title_id, score_delta, count_delta, trending):
+    change_rating(title_id, score_delta, count_delta, trending)
+    change_review_stats(title_id, score_delta, count_delta)
+
+
+@receiver(pre_save, sender=Review)
+def remember_rating_origin(sender, instance, raw, **kwargs):
+    if raw or instance._state.adding or hasattr(instance, '_rating_origin'):
+        return
+    instance._rating_origin = Review.objects.filter(
+        pk=instance.pk).values_list('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    origin = getattr(instance, '_rating_origin', None)
+    weight = trending_weight(instance.score, instance.pub_date)
+    if created or origin is None:
+        change_review_totals(instance.title_id, instance.score, 1,
+                             add_trending(weight))
+    elif origin[0] != instance.title_id:
+        change_review_totals(
+            origin[0], -origin[1], -1,
+            remove_trending(trending_weight(origin[1], instance.pub_date)))
+        change_review_totals(instance.title_id, instance.score, 1,
+                             add_trending(weight))
+    elif origin[1] != instance.score:
+        change_review_totals(
+            instance.title_id, instance.score - origin[1], 0,
+            rescore_trending(trending_weight(origin[1], instance.pub_date),
+                             instance.score / origin[1]))
+    instance._rating_origin = (instance.title_id, instance.score)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    title_id, score = getattr(
+        instance, '_rating_origin', (instance.title_id, instance.score))
+    change_review_totals(
+        title_id, -score, -1,
+        remove_trending(trending_weight(score, instance.pub_date)))
+
+
+@receiver(post_save, sender=Title)
+def update_search_index(sender, instance, raw, **kwargs):
+    if not raw:
+        index_title(instance)
+
+
+@receiver(post_delete, sender=Title)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_title(instance.id)
+
+
+@receiver(post_save, sender=Category)
+def create_category_stats(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        CategoryStats.objects.create(category=instance)
+
+
+@receiver(post_save, sender=Genre)
+def create_genre_stats(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        GenreStats.objects.create(genre=instance)
+
+
+@receiver(pre_save, sender=Title)
+def remember_category_origin(sender, instance, raw, **kwargs):
+    if raw or instance._state.adding or hasattr(instance, '_category_origin'):
+        return
+    instance._category_origin = Title.objects.filter(
+        pk=instance.pk).values_list('category_id', flat=True).first()
+
+
+@receiver(post_save, sender=Title)
+def update_category_stats(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    origin = None if created else getattr(instance, '_category_origin', None)
+    if origin != instance.category_id:
+        move_title(instance.pk, origin, instance.category_id)
+    instance._category_origin = instance.category_id
+
+
+@receiver(pre_delete, sender=Title)
+def remove_title_stats(sender, instance, **kwargs):
+    remove_title(instance.pk)
+    deleting_titles().add(instance.pk)
+
+
+@receiver(post_delete, sender=Title)
+def forget_deleted_title(sender, instance, **kwargs):
+    deleting_titles().discard(instance.pk)
+
+
+@receiver(post_save, sender=GenreTitle)
+def add_genre_title_stats(sender, instance, created, raw, **kwargs):
+    if created and not raw:
+        change_genre_titles([instance.genre_id], [instance.title_id], 1)
+
+
+@receiver(post_delete, sender=GenreTitle)
+def remove_genre_title_stats(sender, instance, **kwargs):
+    if instance.title_id in deleting_titles() or defer_genre_link(
+            (instance.title_id, instance.genre_id)):
+        return
+    change_genre_titles([instance.genre_id], [instance.title_id], -1)
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_genre_stats(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_remove':
+        defer_genre_links((pk, instance.pk) if reverse else (instance.pk, pk)
+                          for pk in pk_set or ())
+    elif action == 'post_remove':
+        removed = take_genre_links()
+        if removed and reverse:
+            change_genre_titles(
+                [instance.pk], [title_id for title_id, _ in removed], -1)
+        elif removed:
+            change_genre_titles(
+                [genre_id for _, genre_id in removed], [instance.pk], -1)
+    elif action == 'post_add' and pk_set:
+        if reverse:
+            change_genre_titles([instance.pk], list(pk_set), 1)
+        else:
+            change_genre_titles(list(pk_set), [instance.pk], 1)
@@ -0,0 +1,128 @@
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from .models import (Category, CategoryStats, Genre, GenreStats, GenreTitle,
+                     Title)
+
+_state = threading.local()
+
+
+def deleting_titles():
+    if not hasattr(_state, 'titles'):
+        _state.titles = set()
+    return _state.titles
+
+
+def defer_genre_links(pairs):
+    _state.genre_links = dict.fromkeys(pairs, False)
+
+
+def defer_genre_link(pair):
+    links = getattr(_state, 'genre_links', {})
+    if pair not in links:
+        return False
+    links[pair] = True
+    return True
+
+
+def take_genre_links():
+    links = getattr(_state, 'genre_links', {})
+    _state.genre_links = {}
+    return [pair for pair, removed in links.items() if removed]
+
+
+def title_totals(title_ids):
+    return Title.objects.filter(pk__in=title_ids).aggregate(
+        rating_sum=Coalesce(Sum('rating_sum'), 0),
+        rating_count=Coalesce(Sum('rating_count'), 0))
+
+
+def change_stats(stats, titles, rating_sum, rating_count):
+    return stats.update(
+        title_count=F('title_count') + titles,
+        rating_sum=F('rating_sum') + rating_sum,
+        rating_count=F('rating_count') + rating_count)
+
+
+def change_stats_bulk(stats, key, deltas):
+    groups = defaultdict(list)
+    for pk, delta in deltas.items():
+        if any(delta):
+            groups[tuple(delta)].append(pk)
+    for (titles, rating_sum, rating_count), ids in groups.items():
+        change_stats(stats.filter(**{f'{key}__in': ids}),
+                     titles, rating_sum, rating_count)
+
+
+def title_category_stats(title_id):
+    return CategoryStats.objects.filter(category_id=Subquery(
+        Title.objects.filter(pk=title_id).values('category_id')[:1]))
+
+
+def title_genre_stats(title_id):
+    return GenreStats.objects.filter(genre_id__in=GenreTitle.objects.filter(
+        title_id=title_id).values('genre_id'))
+
+
+def change_review_stats(title_id, score_delta, count_delta):
+    if title_id in deleting_titles():
+        return
+    change_stats(title_category_stats(title_id),
+                 0, score_delta, count_delta)
+    change_stats(title_genre_stats(title_id), 0, score_delta, count_delta)
+
+
+def move_title(title_id, old_category_id, new_category_id):
+    totals = title_totals([title_id])
+    for category_id, sign in ((old_category_id, -1), (new_category_id, 1)):
+        if category_id is not None:
+            change_stats(
+                CategoryStats.objects.filter(category_id=category_id),
+                sign, sign * totals['rating_sum'],
+                sign * totals['rating_count'])
+
+
+def change_genre_titles(genre_ids, title_ids, sign):
+    totals = title_totals(title_ids)
+    change_stats(GenreStats.objects.filter(genre_id__in=genre_ids),
+                 sign * len(title_ids), sign * totals['rating_sum'],
+                 sign * totals['rating_count'])
+
+
+def remove_title(title_id):
+    totals = title_totals([title_id])
+    change_stats(title_category_stats(title_id),
+                 -1, -totals['rating_sum'], -totals['rating_count'])
+    change_stats(title_genre_stats(title_id),
+                 -1, -totals['rating_sum'], -totals['rating_count'])
+
+
+def rebuild_stats():
+    with transaction.atomic():
+        CategoryStats.objects.all().delete()
+        GenreStats.objects.all().delete()
+        categories = Category.objects.annotate(
+            total_titles=Count('titles'),
+            total_sum=Coalesce(Sum('titles__rating_sum'), 0),
+            total_count=Coalesce(Sum('titles__rating_count'), 0))
+        CategoryStats.objects.bulk_create(
+            CategoryStats(category_id=category.id,
+                          title_count=category.total_titles,
+                          rating_sum=category.total_sum,
+                          rating_count=category.total_count)
+            for category in categories)
+        genres = Genre.objects.annotate(
+            total_titles=Count('titles'),
+            total_sum=Coalesce(Sum('titles__title__rating_sum'), 0),
+            total_count=Coalesce(Sum('titles__title__rating_count'), 0))
+        GenreStats.objects.bulk_create(
+            GenreStats(genre_id=genre.id,
+                       title_count=genre.total_titles,
+                       rating_sum=genre.total_sum,
+                       rating_count=genre.total_count)
+            for genre in genres)
+    return len(categories), len(genres)
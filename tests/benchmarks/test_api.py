@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+USERS = int(os.getenv('BENCH_API_USERS', 2000))
+TITLES = int(os.getenv('BENCH_API_TITLES', 2000))
+REVIEWS = int(os.getenv('BENCH_API_REVIEWS', 50000))
+COMMENTS = int(os.getenv('BENCH_API_COMMENTS', 20000))
+REQUESTS = int(os.getenv('BENCH_API_REQUESTS', 200))
+CONCURRENCY = int(os.getenv('BENCH_API_CONCURRENCY', 4))
+UPDATE_BASELINE = os.getenv('BENCH_API_UPDATE_BASELINE') == 'True'
+FAIL_ON_REGRESSION = os.getenv('BENCH_API_FAIL_ON_REGRESSION') == 'True'
+
+
+@pytest.mark.django_db(transaction=True)
+def test_api_endpoints_against_baseline():
+    from django.conf import settings
+
+    from api.benchmark import (ApiBenchmark, find_regressions, load_baseline,
+                               save_baseline, seed_dataset)
+
+    seed_dataset(users=USERS, titles=TITLES, reviews=REVIEWS,
+                 comments=COMMENTS)
+    report = ApiBenchmark(requests=REQUESTS, concurrency=CONCURRENCY).run()
+    for name, result in report['endpoints'].items():
+        print(f'\n{name}: p50 {result["p50"]} мс, p95 {result["p95"]} мс, '
+              f'p99 {result["p99"]} мс, {result["rps"]} RPS, '
+              f'{result["queries"]} запросов', end='')
+    path = settings.BENCHMARK['BASELINE']
+    previous = load_baseline(path)
+    regressions = []
+    if previous is not None:
+        regressions = find_regressions(previous, report,
+                                       settings.BENCHMARK['TOLERANCE'])
+        for regression in regressions:
+            print(f'\nУхудшение {regression.name}: {regression.metric} '
+                  f'{regression.previous} -> {regression.current}', end='')
+    if UPDATE_BASELINE or previous is None:
+        save_baseline(path, report)
+    assert not any(result['errors']
+                   for result in report['endpoints'].values())
+    if FAIL_ON_REGRESSION:
+        assert not regressions
@@ -0,0 +1,26 @@
+import os
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+REVIEWS = int(os.getenv('BENCH_DATASET_REVIEWS', 1000000))
+TARGET_REVIEWS = 10000000
+TARGET_SECONDS = 300
+
+
+def test_generate_reviews_rate(tmp_path):
+    from reviews.dataset import DatasetGenerator
+
+    generator = DatasetGenerator(users=REVIEWS // 10, titles=REVIEWS // 20,
+                                 reviews=REVIEWS, comments=REVIEWS // 5)
+    results = {result.filename: result
+               for result in generator.write_csv(str(tmp_path))}
+    review = results['review.csv']
+    rate = review.rows / review.seconds
+    total = sum(result.rows for result in results.values())
+    print(f'\n{review.rows} отзывов за {review.seconds:.1f} с '
+          f'({rate:.0f} строк/с), всего {total} строк; '
+          f'{TARGET_REVIEWS} отзывов ~ {TARGET_REVIEWS / rate:.0f} с')
+    assert review.rows == REVIEWS
+    assert TARGET_REVIEWS / rate < TARGET_SECONDS
@@ -0,0 +1,120 @@
+import os
+import random
+import statistics
+import time
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.utils import timezone
+
+pytestmark = pytest.mark.benchmark
+
+REVIEWS = int(os.getenv('BENCH_REVIEWS', 200000))
+TITLES = int(os.getenv('BENCH_TITLES', 1000))
+CATALOG_TITLES = int(os.getenv('BENCH_CATALOG_TITLES', 200000))
+CATEGORIES = 20
+REPEAT = 50
+
+
+def build_review(i, hot, rng, now):
+    from reviews.models import Review
+
+    if i < hot:
+        title_id, author_id = 1, i + 1
+    else:
+        title_id = 2 + i % (TITLES - 1)
+        author_id = i // (TITLES - 1) + 1
+    return Review(id=i + 1, title_id=title_id, author_id=author_id,
+                  text='Отзыв', score=rng.randint(1, 10),
+                  pub_date=now - timedelta(minutes=rng.randint(0, 10 ** 6)))
+
+
+def seed_reviews():
+    from reviews.importer import preserve_auto_now
+    from reviews.models import Comment, Review, Title, User
+
+    rng = random.Random(42)
+    now = timezone.now()
+    hot = REVIEWS // 2
+    Title.objects.bulk_create(
+        Title(id=i, name=f'Произведение {i}', year=2000)
+        for i in range(1, TITLES + 1))
+    User.objects.bulk_create(
+        User(id=i, username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(1, hot + REVIEWS // (TITLES - 1) + 2))
+    with preserve_auto_now(Review), preserve_auto_now(Comment):
+        Review.objects.bulk_create(
+            build_review(i, hot, rng, now) for i in range(REVIEWS))
+        Comment.objects.bulk_create(
+            Comment(review_id=1 if i < hot else rng.randint(2, REVIEWS),
+                    author_id=1, text='Комментарий',
+                    pub_date=now - timedelta(minutes=rng.randint(0, 10 ** 6)))
+            for i in range(REVIEWS))
+
+
+def seed_titles():
+    from reviews.models import Category, Title
+
+    rng = random.Random(42)
+    Category.objects.bulk_create(
+        Category(id=i, name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(1, CATEGORIES + 1))
+    Title.objects.bulk_create(
+        Title(id=i, name=f'Произведение {i}', year=rng.randint(1900, 2022),
+              category_id=rng.randint(1, CATEGORIES))
+        for i in range(1, CATALOG_TITLES + 1))
+
+
+def measure(queryset):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        list(queryset.all())
+        timings.append(time.perf_counter() - start)
+    return queryset.explain(), statistics.median(timings) * 1000
+
+
+def find_index(model, name):
+    return next(index for index in model._meta.indexes if index.name == name)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('model_name, index_name, lookup', [
+    ('Review', 'review_title_pub_date_idx', 'title_id'),
+    ('Comment', 'comment_review_pub_date_idx', 'review_id'),
+])
+def test_composite_index_plan(model_name, index_name, lookup):
+    from reviews import models
+
+    seed_reviews()
+    model = getattr(models, model_name)
+    queryset = model.objects.filter(
+        **{lookup: 1}).order_by('-pub_date')[:10]
+    compare_plans(model, index_name, queryset)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_title_category_year_plan():
+    from reviews.models import Title
+
+    seed_titles()
+    queryset = Title.objects.filter(
+        category_id=1, year__gte=2000).order_by('year', 'id')[:10]
+    compare_plans(Title, 'title_category_year_idx', queryset)
+
+
+def compare_plans(model, index_name, queryset):
+    plan_with, median_with = measure(queryset)
+    index = find_index(model, index_name)
+    with connection.schema_editor() as editor:
+        editor.remove_index(model, index)
+    try:
+        plan_without, median_without = measure(queryset)
+    finally:
+        with connection.schema_editor() as editor:
+            editor.add_index(model, index)
+    print(f'\n{index_name}: {median_without:.3f} мс -> {median_with:.3f} мс'
+          f'\nбез индекса: {plan_without}\nс индексом: {plan_with}')
+    assert index_name in plan_with
+    assert 'TEMP B-TREE' not in plan_with
@@ -0,0 +1,77 @@
+import os
+import time
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+TITLES = int(os.getenv('BENCH_LIST_TITLES', 5000))
+REVIEWS = int(os.getenv('BENCH_LIST_REVIEWS', 5000))
+PAGE_SIZE = int(os.getenv('BENCH_LIST_PAGE_SIZE', 100))
+DURATION = float(os.getenv('BENCH_LIST_SECONDS', 3))
+
+
+def seed_data():
+    from reviews.models import (Category, Genre, GenreTitle, Review, Title,
+                                User)
+
+    Category.objects.bulk_create(
+        Category(id=i, name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(1, 11))
+    Genre.objects.bulk_create(
+        Genre(id=i, name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(1, 21))
+    Title.objects.bulk_create(
+        Title(id=i, name=f'Произведение {i}', year=1900 + i % 120,
+              description='Описание ' * 20, category_id=i % 10 + 1,
+              rating_sum=i % 10 * 3, rating_count=3, rating=i % 10)
+        for i in range(1, TITLES + 1))
+    GenreTitle.objects.bulk_create(
+        GenreTitle(title_id=i, genre_id=(i + shift) % 20 + 1)
+        for i in range(1, TITLES + 1) for shift in (0, 7))
+    User.objects.bulk_create(
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(REVIEWS))
+    users = list(User.objects.values_list('id', flat=True))
+    Review.objects.bulk_create(
+        Review(title_id=1, author_id=author_id, text='Отзыв ' * 30,
+               score=author_id % 10 + 1)
+        for author_id in users)
+
+
+def requests_per_second(client, url, params):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        response = client.get(url, params)
+        assert response.status_code == 200
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('url,params', (
+    ('/api/v1/titles/', {}),
+    ('/api/v1/titles/1/reviews/', {}),
+    ('/api/v1/titles/1/reviews/', {'pagination': 'cursor'}),
+))
+def test_list_rendering_throughput(url, params, admin_client, settings,
+                                   monkeypatch):
+    from rest_framework import pagination
+
+    monkeypatch.setattr(pagination.PageNumberPagination, 'page_size',
+                        PAGE_SIZE)
+    monkeypatch.setattr(pagination.CursorPagination, 'page_size', PAGE_SIZE)
+    seed_data()
+    results = {}
+    contents = {}
+    for enabled in (False, True):
+        settings.FAST_LIST_RENDERING = enabled
+        contents[enabled] = admin_client.get(url, params).content
+        results[enabled] = requests_per_second(admin_client, url, params)
+    print(f'\n{url} {params}, {PAGE_SIZE} записей на странице: '
+          f'сериализатор {results[False]:.0f} запросов/с -> '
+          f'values() {results[True]:.0f} запросов/с '
+          f'(x{results[True] / results[False]:.2f})')
+    assert contents[True] == contents[False]
+    assert results[True] > results[False]
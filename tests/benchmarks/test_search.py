@@ -0,0 +1,66 @@
+import os
+import random
+import statistics
+import time
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+TITLES = int(os.getenv('BENCH_SEARCH_TITLES', 1000000))
+REPEAT = 20
+WORDS = ('война', 'мир', 'путешествие', 'история', 'любовь', 'город',
+         'море', 'ночь', 'дорога', 'время', 'песня', 'тайна')
+RARE_WORD = 'кентавр'
+
+
+def seed_titles():
+    from reviews.models import Title
+
+    rng = random.Random(42)
+    batch = []
+    for i in range(1, TITLES + 1):
+        words = rng.sample(WORDS, 3)
+        if i == TITLES // 2:
+            words.append(RARE_WORD)
+        batch.append(Title(id=i, name=' '.join(words).capitalize(),
+                           year=2000,
+                           description=' '.join(rng.sample(WORDS, 6))))
+        if len(batch) == 10000:
+            Title.objects.bulk_create(batch)
+            batch = []
+    Title.objects.bulk_create(batch)
+
+
+def measure(queryset):
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        list(queryset.all())
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize('backend', ('auto', 'tokens'))
+def test_search_latency(backend, settings):
+    from reviews.models import Title
+    from reviews.search import rebuild_search_index, search_titles
+
+    settings.TITLE_SEARCH_BACKEND = backend
+    seed_titles()
+    start = time.perf_counter()
+    rebuild_search_index()
+    indexing = time.perf_counter() - start
+    scan = Title.objects.filter(
+        name__icontains=RARE_WORD).order_by('id')[:10]
+    search = search_titles(Title.objects.all(), RARE_WORD)[:10]
+    assert [title.id for title in search] == [TITLES // 2]
+    median_scan = measure(scan)
+    median_search = measure(search)
+    median_common = measure(
+        search_titles(Title.objects.all(), 'война мир')[:10])
+    print(f'\n{backend}, {TITLES} произведений, индекс за {indexing:.1f} с: '
+          f'icontains {median_scan:.3f} мс -> search {median_search:.3f} мс, '
+          f'частые слова {median_common:.3f} мс')
+    assert median_search < median_scan
@@ -0,0 +1,74 @@
+import pytest
+from django.core.management import call_command
+
+from .common import auth_client, create_reviews
+
+
+class Test08TitleRating:
+
+    def get_title(self, client, title_id):
+        response = client.get(f'/api/v1/titles/{title_id}/')
+        assert response.status_code == 200
+        return response.json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_rating_follows_reviews(self, client, admin_client, admin):
+        reviews, titles, user, moderator = create_reviews(admin_client, admin)
+        title_id = titles[0]['id']
+        assert self.get_title(client, title_id)['rating'] == 4, (
+            'Проверьте, что `rating` произведения равен среднему оценок отзывов'
+        )
+        auth_client(user).patch(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[1]["id"]}/',
+            data={'score': 9})
+        assert self.get_title(client, title_id)['rating'] == 6, (
+            'Проверьте, что `rating` пересчитывается при изменении оценки отзыва'
+        )
+        admin_client.delete(
+            f'/api/v1/titles/{title_id}/reviews/{reviews[0]["id"]}/')
+        assert self.get_title(client, title_id)['rating'] == 6, (
+            'Проверьте, что `rating` пересчитывается при удалении отзыва'
+        )
+        admin_client.delete(f'/api/v1/users/{moderator.username}/')
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert self.get_title(client, title_id)['rating'] is None, (
+            'Проверьте, что `rating` пересчитывается при удалении автора отзыва'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_rebuild_ratings(self, client, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        Title.objects.update(rating_sum=0, rating_count=0, rating=None)
+        call_command('rebuild_ratings')
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (12, 3)
+        assert self.get_title(client, title.pk)['rating'] == 4
+        assert self.get_title(client, titles[1]['id'])['rating'] is None
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_stale_title_save(self, client, admin_client, admin):
+        from reviews.models import Title
+
+        _, titles, user, _ = create_reviews(admin_client, admin)
+        title_id = titles[1]['id']
+        stale = Title.objects.get(pk=title_id)
+        response = auth_client(user).post(
+            f'/api/v1/titles/{title_id}/reviews/',
+            data={'text': 'Новый отзыв', 'score': 8})
+        assert response.status_code == 201
+        stale.description = 'Новое описание'
+        stale.save()
+        title = Title.objects.get(pk=title_id)
+        assert title.description == 'Новое описание'
+        assert (title.rating_sum, title.rating_count, title.rating) == (
+            8, 1, 8), (
+            'Проверьте, что сохранение произведения не перезаписывает '
+            'рейтинг, который поддерживают отзывы'
+        )
+        assert title.trending is not None
+        response = admin_client.patch(f'/api/v1/titles/{title_id}/',
+                                      data={'year': 2001})
+        assert response.status_code == 200
+        assert self.get_title(client, title_id)['rating'] == 8
@@ -0,0 +1,118 @@
+import pytest
+
+from .common import create_comments, create_reviews, create_titles
+
+
+class Test09QueryBudget:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_list(self, client, admin_client,
+                            django_assert_max_num_queries):
+        create_titles(admin_client)
+        create_titles(admin_client)
+        with django_assert_max_num_queries(4):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 4, (
+            'Проверьте, что список произведений загружает жанры и категории '
+            'за постоянное число запросов'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_title_detail(self, client, admin_client,
+                             django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        with django_assert_max_num_queries(3):
+            response = client.get(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.status_code == 200
+        assert len(response.json()['genre']) == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_titles_list_filtered(self, client, admin_client, admin,
+                                     django_assert_max_num_queries):
+        create_reviews(admin_client, admin)
+        with django_assert_max_num_queries(4):
+            response = client.get('/api/v1/titles/?genre=horror')
+        assert response.status_code == 200
+        assert response.json()['results'][0]['rating'] == 4
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_review_create(self, admin_client, user_client, monkeypatch,
+                              django_assert_max_num_queries):
+        from django.db import IntegrityError
+
+        from api.serializers import ReviewSerializer
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = {'text': 'Отзыв', 'score': 7}
+        with django_assert_max_num_queries(7):
+            response = user_client.post(url, data=data)
+        assert response.status_code == 201
+        with django_assert_max_num_queries(5):
+            response = user_client.post(url, data=data)
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв отклоняется по ограничению '
+            '`unique_review` без проверки перед вставкой'
+        )
+
+        def broken_save(self, **kwargs):
+            raise IntegrityError('FOREIGN KEY constraint failed')
+
+        monkeypatch.setattr(ReviewSerializer, 'save', broken_save)
+        with pytest.raises(IntegrityError):
+            admin_client.post(url, data=data)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_comment_create(self, admin_client, admin, user_client,
+                               django_assert_max_num_queries):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        with django_assert_max_num_queries(3):
+            response = user_client.post(url, data={'text': 'Комментарий'})
+        assert response.status_code == 201
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_reviews_list(self, client, admin_client, admin,
+                             django_assert_max_num_queries):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for params in ({}, {'pagination': 'cursor'}):
+            with django_assert_max_num_queries(4):
+                response = client.get(url, params)
+            assert response.status_code == 200
+            assert len(response.json()['results']) == len(reviews), (
+                'Проверьте, что авторы отзывов загружаются вместе с '
+                'отзывами, а не отдельным запросом на каждый отзыв'
+            )
+        with django_assert_max_num_queries(3):
+            response = client.get(f'{url}{reviews[1]["id"]}/')
+        assert response.json()['author'] == reviews[1]['author']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_comments_list(self, client, admin_client, admin,
+                              django_assert_max_num_queries):
+        _, reviews, titles, _, _ = create_comments(admin_client, admin)
+        url = (f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+               f'{reviews[0]["id"]}/comments/')
+        with django_assert_max_num_queries(4):
+            response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 3, (
+            'Проверьте, что авторы комментариев загружаются вместе с '
+            'комментариями, а не отдельным запросом на каждый комментарий'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_08_author_permission(self, admin_client, admin, user_client,
+                                  django_assert_max_num_queries):
+        reviews, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with django_assert_max_num_queries(4):
+            response = user_client.patch(f'{url}{reviews[0]["id"]}/',
+                                         data={'text': 'Чужой'})
+        assert response.status_code == 403, (
+            'Проверьте, что права автора проверяются по author_id без '
+            'загрузки пользователя'
+        )
@@ -0,0 +1,56 @@
+import pytest
+
+from .common import create_titles
+
+
+@pytest.fixture
+def profiler(settings):
+    from api.profiling import registry
+
+    settings.QUERY_PROFILER = {
+        'ENABLED': True,
+        'RAISE_ON_BUDGET': True,
+        'BUDGETS': {'TitleViewSet.list': 4},
+    }
+    registry.reset()
+    yield settings.QUERY_PROFILER
+    registry.reset()
+
+
+class Test10QueryProfiler:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_profile_report(self, profiler, client, admin_client,
+                               user_client):
+        create_titles(admin_client)
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        response = user_client.get('/api/v1/profiling/queries/')
+        assert response.status_code == 403, (
+            'Проверьте, что отчёт профилировщика доступен только администратору'
+        )
+        response = admin_client.get('/api/v1/profiling/queries/')
+        assert response.status_code == 200
+        report = response.json()
+        assert report['TitleViewSet.list']['requests'] == 2
+        assert report['TitleViewSet.list']['max_queries'] == 4
+        assert report['TitleViewSet.list']['slowest_sql']
+        assert report['TitleViewSet.create']['requests'] == 2
+        assert report['GenreViewSet.create']['requests'] == 3
+        response = admin_client.delete('/api/v1/profiling/queries/')
+        assert response.status_code == 204
+        response = admin_client.get('/api/v1/profiling/queries/')
+        assert list(response.json()) == ['query_profile']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_budget_exceeded(self, profiler, client, admin_client):
+        from api.profiling import QueryBudgetExceeded
+
+        create_titles(admin_client)
+        profiler['BUDGETS'] = {'TitleViewSet.list': 1}
+        with pytest.raises(QueryBudgetExceeded):
+            client.get('/api/v1/titles/')
+        profiler['RAISE_ON_BUDGET'] = False
+        response = client.get('/api/v1/titles/?year=2000')
+        assert response.status_code == 200
+        assert response['X-Query-Budget-Exceeded'] == '4/1'
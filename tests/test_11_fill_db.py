@@ -0,0 +1,128 @@
+import csv
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(filename):
+    with open(os.path.join(DATA_PATH, filename), encoding='utf-8') as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+class Test11FillDb:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_import(self):
+        from reviews.models import Comment, GenreTitle, Review, Title, User
+
+        out = StringIO()
+        call_command('fill_db', '--path', DATA_PATH, '--batch-size', '10',
+                     stdout=out)
+        assert 'строк/с' in out.getvalue(), (
+            'Проверьте, что `fill_db` сообщает скорость импорта'
+        )
+        for model, filename in ((Title, 'titles.csv'),
+                                (GenreTitle, 'genre_title.csv'),
+                                (User, 'users.csv'),
+                                (Review, 'review.csv'),
+                                (Comment, 'comments.csv')):
+            assert model.objects.count() == count_rows(filename), (
+                f'Проверьте, что `fill_db` загружает все строки {filename}'
+            )
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.isoformat() == '2019-09-24T21:08:21.567000+00:00', (
+            'Проверьте, что `fill_db` сохраняет `pub_date` из CSV'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        assert title.rating_count == title.reviews.count(), (
+            'Проверьте, что после импорта рейтинги произведений пересчитаны'
+        )
+
+        out = StringIO()
+        call_command('fill_db', '--path', DATA_PATH, stdout=out)
+        assert Review.objects.count() == count_rows('review.csv'), (
+            'Проверьте, что повторный запуск `fill_db` не создаёт дубликаты'
+        )
+        assert (f'review.csv содержит {count_rows("review.csv")} строк, '
+                f'пропущено 0, уже было в БД {count_rows("review.csv")}'
+                in out.getvalue()), (
+            'Проверьте, что `fill_db` отдельно сообщает о строках, '
+            'которые уже были в БД'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_resume_from_checkpoint(self, tmp_path, monkeypatch):
+        from reviews import importer
+        from reviews.models import Review
+
+        import_chunk = importer.import_chunk
+        calls = []
+
+        def failing_import_chunk(filename, rows, *args):
+            if filename == 'review.csv':
+                calls.append(rows)
+                if len(calls) == 3:
+                    raise RuntimeError('Сбой загрузки')
+            return import_chunk(filename, rows, *args)
+
+        monkeypatch.setattr(importer, 'import_chunk', failing_import_chunk)
+        with pytest.raises(RuntimeError):
+            call_command('fill_db', '--path', DATA_PATH, '--chunk-size', '20',
+                         '--checkpoint-dir', str(tmp_path), stdout=StringIO())
+        assert Review.objects.count() == 40
+
+        calls.clear()
+        monkeypatch.setattr(importer, 'import_chunk', failing_import_chunk)
+        out = StringIO()
+        call_command('fill_db', '--path', DATA_PATH, '--chunk-size', '20',
+                     '--checkpoint-dir', str(tmp_path), stdout=out)
+        assert 'восстановлено из контрольной точки 2' in out.getvalue(), (
+            'Проверьте, что `fill_db` пропускает части, сохранённые '
+            'в контрольной точке'
+        )
+        assert calls[0][0]['id'] == '43'
+        assert Review.objects.count() == count_rows('review.csv')
+        assert list(tmp_path.iterdir()) == [], (
+            'Проверьте, что после успешной загрузки контрольные точки удаляются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_upsert(self):
+        from reviews.models import Review
+
+        call_command('fill_db', '--path', DATA_PATH, stdout=StringIO())
+        original = Review.objects.get(pk=1)
+        Review.objects.filter(pk=1).update(text='Изменено', score=1)
+        call_command('fill_db', '--path', DATA_PATH, stdout=StringIO())
+        assert Review.objects.get(pk=1).text == 'Изменено'
+        call_command('fill_db', '--path', DATA_PATH, '--upsert',
+                     stdout=StringIO())
+        review = Review.objects.get(pk=1)
+        assert (review.text, review.score) == (original.text, original.score), (
+            'Проверьте, что `fill_db --upsert` обновляет существующие строки'
+        )
+        assert review.title.rating_count == review.title.reviews.count()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_workers(self):
+        from reviews.models import Comment, Review, Title
+
+        out = StringIO()
+        call_command('fill_db', '--path', DATA_PATH, '--chunk-size', '20',
+                     '--workers', '2', stdout=out)
+        for model, filename in ((Title, 'titles.csv'),
+                                (Review, 'review.csv'),
+                                (Comment, 'comments.csv')):
+            assert model.objects.count() == count_rows(filename), (
+                f'Проверьте, что `fill_db --workers 2` загружает все строки '
+                f'{filename}'
+            )
+        assert 'уже было в БД 0' in out.getvalue()
+        title = Title.objects.filter(rating_count__gt=0).first()
+        assert title.rating_count == title.reviews.count()
@@ -0,0 +1,73 @@
+import pytest
+
+from .common import create_titles
+
+
+class Test12ResponseCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_cached(self, client, admin_client, user_client,
+                              django_assert_num_queries):
+        titles, _, genres = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        client.get('/api/v1/titles/')
+        client.get(url)
+        with django_assert_num_queries(0):
+            assert client.get('/api/v1/titles/').status_code == 200
+            response = client.get(url)
+        assert response.json()['rating'] is None, (
+            'Проверьте, что анонимные GET-запросы `/api/v1/titles/` '
+            'отдаются из кэша'
+        )
+        user_client.post(f'{url}reviews/', data={'text': 'Ок', 'score': 7})
+        assert client.get(url).json()['rating'] == 7, (
+            'Проверьте, что кэш сбрасывается при добавлении отзыва'
+        )
+        admin_client.patch(url, data={'name': 'Поворот обратно'})
+        assert client.get(url).json()['name'] == 'Поворот обратно'
+        admin_client.delete(f'/api/v1/genres/{genres[0]["slug"]}/')
+        assert len(client.get(url).json()['genre']) == 1, (
+            'Проверьте, что кэш сбрасывается при удалении жанра'
+        )
+        response = client.get('/api/v1/titles/?year=2020')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что ключ кэша учитывает параметры запроса'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_categories_cached(self, client, admin_client,
+                                  django_assert_num_queries):
+        admin_client.post('/api/v1/categories/',
+                          data={'name': 'Фильм', 'slug': 'films'})
+        client.get('/api/v1/categories/')
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/categories/')
+        assert response.json()['count'] == 1
+        admin_client.post('/api/v1/categories/',
+                          data={'name': 'Книги', 'slug': 'books'})
+        assert client.get('/api/v1/categories/').json()['count'] == 2, (
+            'Проверьте, что кэш категорий сбрасывается при добавлении'
+        )
+        with django_assert_num_queries(3):
+            admin_client.get('/api/v1/categories/')
+
+    def test_03_process_local_cache(self, settings, tmp_path):
+        from django.core.checks import run_checks
+
+        from api.cache import get_response_timeout
+
+        settings.DEBUG = False
+        assert get_response_timeout() == settings.API_CACHE[
+            'LOCAL_TIMEOUT'], (
+            'Проверьте, что для кэша в памяти процесса ответы хранятся '
+            'недолго'
+        )
+        assert [message.id for message in run_checks(tags=['caches'])] == [
+            'api.W001'], (
+            'Проверьте, что `check` предупреждает о кэше в памяти процесса'
+        )
+        settings.CACHES = {'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path)}}
+        assert get_response_timeout() == settings.API_CACHE['TIMEOUT']
+        assert run_checks(tags=['caches']) == []
@@ -0,0 +1,78 @@
+import pytest
+
+from .common import auth_client, create_comments, create_titles
+
+
+class Test13ConditionalGet:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_etag(self, admin_client, admin):
+        comments, reviews, titles, user, _ = create_comments(
+            admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = admin_client.get(url)
+        etag = response.get('ETag')
+        assert etag and not response.get('Last-Modified'), (
+            'Проверьте, что GET `/api/v1/titles/{title_id}/reviews/` '
+            'возвращает `ETag` без `Last-Modified`'
+        )
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что при совпадении `If-None-Match` возвращается 304'
+        )
+        assert response['ETag'] == etag
+        last_modified = admin_client.get(
+            f'{url}{reviews[0]["id"]}/')['Last-Modified']
+        response = admin_client.get(f'{url}{reviews[0]["id"]}/',
+                                    HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == 304
+        admin_client.post('/api/v1/auth/signup/', data={
+            'username': 'newcomer', 'email': 'newcomer@yamdb.fake'})
+        assert admin_client.get(
+            url, HTTP_IF_NONE_MATCH=etag).status_code == 304, (
+            'Проверьте, что регистрация пользователя не меняет `ETag` отзывов'
+        )
+        admin_client.patch(f'/api/v1/users/{user.username}/',
+                           data={'username': 'renamed'})
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что `ETag` меняется при смене имени автора'
+        )
+        etag = response['ETag']
+        auth_client(user).patch(f'{url}{reviews[1]["id"]}/',
+                                data={'text': 'Новый текст'})
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что `ETag` меняется при изменении отзыва'
+        )
+        assert response['ETag'] != etag
+
+        url = f'{url}{reviews[0]["id"]}/comments/'
+        etag = admin_client.get(url)['ETag']
+        admin_client.delete(f'{url}{comments[0]["id"]}/')
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.json()['count'] == 2
+        response = admin_client.get(f'{url}{comments[1]["id"]}/')
+        assert response.status_code == 200 and response.get('ETag')
+        response = admin_client.get(f'{url}{comments[0]["id"]}/')
+        assert response.status_code == 404
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_cached_titles_not_modified(self, client, admin_client,
+                                           django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        etag = client.get(url)['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, (
+            'Проверьте, что кэшированный ответ поддерживает `If-None-Match`'
+        )
+        assert admin_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+        admin_client.patch(url, data={'year': 2001})
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+        response = client.get('/api/v1/categories/')
+        assert client.get(
+            '/api/v1/categories/', HTTP_IF_NONE_MATCH=response['ETag']
+        ).status_code == 304
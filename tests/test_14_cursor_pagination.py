@@ -0,0 +1,99 @@
+import pytest
+
+from .common import create_titles
+
+
+def create_many_reviews(title_id, count, start=0):
+    from reviews.models import Review, User
+
+    for number in range(start, start + count):
+        author = User.objects.create(
+            username=f'reader{number}', email=f'reader{number}@yamdb.fake')
+        Review.objects.create(title_id=title_id, author=author,
+                              text=f'Отзыв {number}', score=5)
+
+
+class Test14CursorPagination:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_reviews_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        create_many_reviews(titles[0]['id'], 15)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = client.get(url, {'pagination': 'cursor'}).json()
+        assert 'count' not in data and data['next'], (
+            'Проверьте, что `?pagination=cursor` включает курсорную пагинацию'
+        )
+        seen = [review['id'] for review in data['results']]
+        create_many_reviews(titles[0]['id'], 3, start=15)
+        data = client.get(data['next']).json()
+        seen += [review['id'] for review in data['results']]
+        assert data['next'] is None
+        assert len(seen) == len(set(seen)) == 15, (
+            'Проверьте, что курсорная пагинация устойчива к новым отзывам'
+        )
+        assert client.get(url).json()['count'] == 18
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_comments_cursor_by_settings(self, settings, client,
+                                            admin_client, admin):
+        from reviews.models import Comment, Review
+
+        settings.REVIEWS_PAGINATION = 'cursor'
+        titles, _, _ = create_titles(admin_client)
+        review = Review.objects.create(title_id=titles[0]['id'],
+                                       author=admin, text='Отзыв', score=5)
+        Comment.objects.bulk_create(
+            Comment(review=review, author=admin, text=f'Комментарий {i}')
+            for i in range(12))
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/{review.id}/comments/'
+        data = client.get(url).json()
+        assert len(data['results']) == 10 and 'count' not in data
+        ids = [comment['id'] for comment in data['results']]
+        assert ids == sorted(ids, reverse=True), (
+            'Проверьте, что комментарии с одинаковой датой упорядочены по id'
+        )
+        assert 'count' in client.get(url, {'pagination': 'page'}).json()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_same_pub_date_keyset(self, client, admin_client):
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from reviews.models import Review, User
+
+        titles, _, _ = create_titles(admin_client)
+        pub_date = timezone.now() - timedelta(days=1)
+        User.objects.bulk_create(
+            User(username=f'twin{i}', email=f'twin{i}@yamdb.fake')
+            for i in range(26))
+        Review.objects.bulk_create(
+            Review(title_id=titles[0]['id'], author=author, text='Отзыв',
+                   score=5)
+            for author in User.objects.filter(username__startswith='twin'))
+        newest = Review.objects.order_by('id').last()
+        Review.objects.exclude(pk=newest.pk).update(pub_date=pub_date)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        data = client.get(url, {'pagination': 'cursor'}).json()
+        pages = [[review['id'] for review in data['results']]]
+        while data['next']:
+            late = Review.objects.create(
+                title_id=titles[0]['id'], text='Новый', score=5,
+                author=User.objects.create(
+                    username=f'late{len(pages)}',
+                    email=f'late{len(pages)}@yamdb.fake'))
+            Review.objects.filter(pk=late.pk).update(pub_date=pub_date)
+            data = client.get(data['next']).json()
+            pages.append([review['id'] for review in data['results']])
+        seen = sum(pages, [])
+        assert seen[1:] == sorted(seen[1:], reverse=True) \
+            and len(seen) == len(set(seen)) == 26, (
+                'Проверьте, что отзывы с одинаковой датой не повторяются '
+                'и не пропускаются между страницами'
+            )
+        first = client.get(url, {'pagination': 'cursor'}).json()
+        data = client.get(client.get(first['next']).json()['previous']).json()
+        assert data['results'] == first['results'], (
+            'Проверьте, что ссылка `previous` возвращает на прежнюю страницу'
+        )
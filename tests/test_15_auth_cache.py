@@ -0,0 +1,35 @@
+import pytest
+
+
+class Test15AuthenticatedUserCache:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_user_cached(self, user_client, django_assert_num_queries):
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        with django_assert_num_queries(0):
+            response = user_client.get('/api/v1/users/me/')
+        assert response.json()['role'] == 'user', (
+            'Проверьте, что аутентифицированный пользователь берётся из кэша'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_invalidation(self, admin_client, user_client, user):
+        assert user_client.get('/api/v1/users/').status_code == 403
+        admin_client.patch(f'/api/v1/users/{user.username}/',
+                           data={'role': 'admin'})
+        assert user_client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что кэш пользователя сбрасывается при смене роли'
+        )
+        user_client.patch('/api/v1/users/me/', data={'bio': 'Новое'})
+        assert user_client.get('/api/v1/users/me/').json()['bio'] == 'Новое'
+        admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert user_client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что кэш пользователя сбрасывается при удалении'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_inactive_user(self, user_client, user):
+        assert user_client.get('/api/v1/users/me/').status_code == 200
+        user.is_active = False
+        user.save()
+        assert user_client.get('/api/v1/users/me/').status_code == 401
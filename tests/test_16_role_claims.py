@@ -0,0 +1,79 @@
+import pytest
+from rest_framework.test import APIClient
+
+
+def claims_client(user):
+    from api.tokens import RoleAccessToken
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}')
+    return client
+
+
+class Test16RoleClaims:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_send_token_with_claims(self, settings, client, user):
+        from django.contrib.auth.tokens import default_token_generator
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        settings.JWT_ROLE_CLAIMS = True
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        token = AccessToken(response.json()['token'])
+        assert (token['role'], token['is_staff'], token['ver']) == (
+            'user', False, 0), (
+            'Проверьте, что при JWT_ROLE_CLAIMS токен содержит роль и версию'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_permissions_without_user_lookup(self, admin,
+                                                django_assert_num_queries):
+        admin_client = claims_client(admin)
+        assert admin_client.get('/api/v1/users/').status_code == 200
+        with django_assert_num_queries(2):
+            response = admin_client.get('/api/v1/users/')
+        assert response.status_code == 200, (
+            'Проверьте, что права администратора берутся из токена '
+            'без загрузки пользователя'
+        )
+        response = admin_client.get('/api/v1/users/me/')
+        assert response.json()['email'] == admin.email
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_revocation(self, admin_client, user):
+        client = claims_client(user)
+        assert client.get('/api/v1/users/').status_code == 403
+        response = client.post('/api/v1/categories/',
+                               data={'name': 'Фильм', 'slug': 'films'})
+        assert response.status_code == 403
+        admin_client.patch(f'/api/v1/users/{user.username}/',
+                           data={'role': 'admin'})
+        assert client.get('/api/v1/users/me/').status_code == 401, (
+            'Проверьте, что смена роли отзывает выданные токены'
+        )
+        user.refresh_from_db()
+        client = claims_client(user)
+        assert client.get('/api/v1/users/').status_code == 200
+        admin_client.patch(f'/api/v1/users/{user.username}/',
+                           data={'bio': 'Без смены роли'})
+        assert client.get('/api/v1/users/').status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_author_from_claims(self, admin_client, user):
+        from .common import create_titles
+
+        titles, _, _ = create_titles(admin_client)
+        client = claims_client(user)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        response = client.post(url, data={'text': 'Отзыв', 'score': 8})
+        assert response.status_code == 201
+        assert response.json()['author'] == user.username
+        review_id = response.json()['id']
+        response = client.patch(f'{url}{review_id}/', data={'score': 9})
+        assert response.status_code == 200, (
+            'Проверьте, что автор может изменить свой отзыв с токеном-claims'
+        )
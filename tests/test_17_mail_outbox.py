@@ -0,0 +1,84 @@
+from io import StringIO
+from smtplib import SMTPException
+from unittest import mock
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+from reviews.models import OutgoingMail
+from reviews.outbox import deliver_batch
+
+
+class Test17MailOutbox:
+    url_signup = '/api/v1/auth/signup/'
+
+    def signup(self, client, username):
+        return client.post(self.url_signup, data={
+            'username': username, 'email': f'{username}@yamdb.fake'})
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_signup_enqueues(self, client):
+        response = self.signup(client, 'queued')
+        assert response.status_code == 200
+        assert len(mail.outbox) == 0, (
+            'Проверьте, что письмо с кодом не отправляется внутри запроса'
+        )
+        queued = OutgoingMail.objects.get()
+        assert queued.recipient == 'queued@yamdb.fake'
+        assert queued.sent is None, (
+            'Проверьте, что письмо с кодом ставится в очередь'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_batch_reuses_connection(self, client):
+        for number in range(3):
+            self.signup(client, f'user{number}')
+        with mock.patch('reviews.outbox.get_connection',
+                        wraps=mail.get_connection) as get_connection:
+            result = deliver_batch()
+        assert get_connection.call_count == 1, (
+            'Проверьте, что пачка писем отправляется через одно соединение'
+        )
+        assert result.sent == 3 and len(mail.outbox) == 3
+        assert not OutgoingMail.objects.filter(sent__isnull=True).exists()
+        assert deliver_batch().sent == 0, (
+            'Проверьте, что отправленные письма не отправляются повторно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_retry_with_backoff(self, client):
+        self.signup(client, 'retry')
+        with mock.patch('django.core.mail.EmailMessage.send',
+                        side_effect=SMTPException('down')):
+            result = deliver_batch(max_attempts=2)
+        assert result.deferred == 1 and result.sent == 0
+        queued = OutgoingMail.objects.get()
+        assert queued.attempts == 1 and 'down' in queued.last_error
+        first_delay = queued.next_attempt - queued.created
+        assert deliver_batch().sent == 0, (
+            'Проверьте, что повторная отправка откладывается'
+        )
+
+        OutgoingMail.objects.update(next_attempt=queued.created)
+        with mock.patch('django.core.mail.EmailMessage.send',
+                        side_effect=SMTPException('down')):
+            result = deliver_batch(max_attempts=2)
+        assert result.dropped == 1, (
+            'Проверьте, что после исчерпания попыток письмо отбрасывается'
+        )
+        queued.refresh_from_db()
+        assert queued.next_attempt - queued.created > first_delay, (
+            'Проверьте, что пауза между попытками растёт экспоненциально'
+        )
+        OutgoingMail.objects.update(next_attempt=queued.created)
+        assert deliver_batch(max_attempts=2).sent == 0
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_command(self, client):
+        self.signup(client, 'command')
+        out = StringIO()
+        call_command('send_mail_outbox', '--once', stdout=out)
+        assert len(mail.outbox) == 1
+        assert 'Итого отправлено 1' in out.getvalue()
+        assert 'в очереди 0' in out.getvalue()
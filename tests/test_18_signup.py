@@ -0,0 +1,68 @@
+import pytest
+
+from api.throttling import SignupIPThrottle
+
+
+class Test18SignupFastPath:
+    url_signup = '/api/v1/auth/signup/'
+    url_token = '/api/v1/auth/token/'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_existing_user_single_lookup(self, client, user,
+                                            django_assert_num_queries):
+        data = {'username': user.username, 'email': user.email}
+        with django_assert_num_queries(2):
+            response = client.post(self.url_signup, data=data)
+        assert response.status_code == 200, (
+            'Проверьте, что повторный запрос кода выполняет один запрос '
+            'поиска пользователя и одну запись в очередь писем'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_conflicting_users(self, client, user, admin):
+        response = client.post(self.url_signup, data={
+            'username': user.username, 'email': admin.email})
+        assert response.status_code == 400, (
+            'Проверьте, что нельзя зарегистрироваться с чужими username '
+            'и email одновременно'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_email_throttle(self, client, django_assert_num_queries):
+        data = {'username': 'throttled', 'email': 'throttled@yamdb.fake'}
+        for _ in range(5):
+            assert client.post(self.url_signup, data=data).status_code == 200
+        with django_assert_num_queries(0):
+            response = client.post(self.url_signup, data=data)
+        assert response.status_code == 429, (
+            'Проверьте, что частые запросы кода на один email отклоняются '
+            'до обращения к БД'
+        )
+        response = client.post(self.url_signup, data={
+            'username': 'other', 'email': 'other@yamdb.fake'})
+        assert response.status_code == 200
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_ip_throttle(self, client, monkeypatch):
+        monkeypatch.setattr(SignupIPThrottle, 'THROTTLE_RATES',
+                            {'signup': '2/hour'})
+        for number in range(2):
+            response = client.post(self.url_signup, data={
+                'username': f'user{number}',
+                'email': f'user{number}@yamdb.fake'})
+            assert response.status_code == 200
+        response = client.post(self.url_signup, data={
+            'username': 'user3', 'email': 'user3@yamdb.fake'})
+        assert response.status_code == 429, (
+            'Проверьте, что частые запросы кода с одного IP отклоняются'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_token_throttle(self, client, user):
+        data = {'username': user.username, 'confirmation_code': 'wrong'}
+        for _ in range(10):
+            assert client.post(self.url_token, data=data).status_code == 400
+        response = client.post(self.url_token, data=data)
+        assert response.status_code == 429, (
+            'Проверьте, что подбор кода подтверждения ограничен'
+        )
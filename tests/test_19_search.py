@@ -0,0 +1,74 @@
+import pytest
+
+from reviews.models import Title, TitleSearchToken
+from reviews.search import rebuild_search_index, use_fts
+
+
+@pytest.fixture(params=('auto', 'tokens'))
+def search_backend(request, settings):
+    settings.TITLE_SEARCH_BACKEND = request.param
+    return request.param
+
+
+@pytest.fixture
+def search_titles(search_backend):
+    return [
+        Title.objects.create(name='Война и мир', year=1869,
+                             description='Роман-эпопея о войне 1812 года'),
+        Title.objects.create(name='Мир', year=2000,
+                             description='Книга о том, как война сменилась на мир'),
+        Title.objects.create(name='Ёжик в тумане', year=1975,
+                             description='Мультфильм'),
+    ]
+
+
+class Test19TitleSearch:
+    url = '/api/v1/titles/'
+
+    def search(self, client, query):
+        response = client.get(self.url, {'search': query})
+        assert response.status_code == 200
+        return [title['name'] for title in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_relevance(self, client, search_titles):
+        assert self.search(client, 'мир') == ['Мир', 'Война и мир'], (
+            'Проверьте, что поиск упорядочивает произведения по '
+            'релевантности, совпадение в названии весит больше'
+        )
+        assert self.search(client, 'ВОЙНА мир') == ['Война и мир', 'Мир']
+        assert self.search(client, 'ежик') == ['Ёжик в тумане'], (
+            'Проверьте, что поиск не учитывает регистр и диакритику'
+        )
+        assert self.search(client, 'мультфильм мир') == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_sync(self, client, admin_client, search_titles):
+        title = search_titles[2]
+        title.name = 'Ёжик в облаках'
+        title.save()
+        assert self.search(client, 'туман') == []
+        assert self.search(client, 'облаках') == ['Ёжик в облаках']
+        admin_client.delete(f'{self.url}{title.id}/')
+        assert self.search(client, 'облаках') == [], (
+            'Проверьте, что удалённое произведение исчезает из индекса'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_rebuild(self, client, search_titles):
+        Title.objects.filter(id=search_titles[2].id).update(name='Ёжик')
+        assert rebuild_search_index() == 3
+        assert self.search(client, 'тумане') == []
+        assert self.search(client, 'ёжик') == ['Ёжик']
+        assert TitleSearchToken.objects.exists() != use_fts(), (
+            'Проверьте, что индекс строится только выбранным движком поиска'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_filters_combined(self, client, search_titles):
+        response = client.get(self.url, {'search': 'мир', 'year': 2000})
+        assert [title['name'] for title in response.json()['results']] == [
+            'Мир'], (
+            'Проверьте, что поиск сочетается с остальными фильтрами'
+        )
+        assert response.json()['count'] == 1
@@ -0,0 +1,68 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, User
+
+
+class Test20PrefixSearch:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_users_prefix(self, admin_client, admin):
+        for username in ('Alice', 'alina', 'ALBERT', 'bob', 'malina'):
+            User.objects.create(username=username,
+                                email=f'{username}@yamdb.fake')
+        response = admin_client.get('/api/v1/users/',
+                                    {'search': 'Ali', 'search_mode': 'prefix'})
+        assert response.status_code == 200
+        assert [user['username'] for user in response.json()['results']] == [
+            'Alice', 'alina'], (
+            'Проверьте, что поиск по префиксу не учитывает регистр и не '
+            'находит совпадения в середине имени'
+        )
+        response = admin_client.get('/api/v1/users/', {'search': 'ali'})
+        assert len(response.json()['results']) == 3, (
+            'Проверьте, что без search_mode поиск работает как раньше'
+        )
+        for last in ('\U0010ffff', '\ud7ff'):
+            response = admin_client.get('/api/v1/users/', {
+                'search': f'ali{last}', 'search_mode': 'prefix'})
+            assert response.status_code == 200, (
+                'Проверьте, что префикс с последним символом Unicode или '
+                'символом перед суррогатами не приводит к ошибке сервера'
+            )
+            assert response.json()['results'] == []
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_folded_on_save(self, admin):
+        admin.username = 'НовыйАдмин'
+        admin.save(update_fields=['username'])
+        admin.refresh_from_db()
+        assert admin.username_search == 'новыйадмин', (
+            'Проверьте, что нормализованное поле обновляется при сохранении'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('model, url', [
+        (Category, '/api/v1/categories/'),
+        (Genre, '/api/v1/genres/'),
+    ])
+    def test_03_names_prefix(self, client, model, url):
+        names = ('Фильм', 'фильмы', 'Книга', 'Кинофильм')
+        for number, name in enumerate(names):
+            model.objects.create(name=name, slug=f'slug-{number}')
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, {'search': 'ФИЛЬ',
+                                        'search_mode': 'prefix'})
+        assert [item['name'] for item in response.json()['results']] == [
+            'Фильм', 'фильмы']
+        plans = [connection.ops.explain_query_prefix() + ' ' + query['sql']
+                 for query in queries.captured_queries
+                 if 'name_search' in query['sql']]
+        assert plans
+        with connection.cursor() as cursor:
+            for plan in plans:
+                cursor.execute(plan)
+                assert 'INDEX' in str(cursor.fetchall()), (
+                    'Проверьте, что поиск по префиксу использует индекс'
+                )
@@ -0,0 +1,74 @@
+import pytest
+
+from reviews.models import CategoryStats, GenreStats, Review
+from reviews.stats import rebuild_stats
+
+from .common import create_reviews
+
+
+def snapshot():
+    return (
+        sorted(CategoryStats.objects.values_list(
+            'category_id', 'title_count', 'rating_sum', 'rating_count')),
+        sorted(GenreStats.objects.values_list(
+            'genre_id', 'title_count', 'rating_sum', 'rating_count')),
+    )
+
+
+def assert_consistent():
+    incremental = snapshot()
+    rebuild_stats()
+    assert incremental == snapshot(), (
+        'Проверьте, что статистика жанров и категорий, обновляемая '
+        'сигналами, совпадает с пересчитанной'
+    )
+
+
+class Test21GenreCategoryStats:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_stats_endpoints(self, client, admin_client, admin,
+                                django_assert_num_queries):
+        create_reviews(admin_client, admin)
+        with django_assert_num_queries(1):
+            response = client.get('/api/v1/categories/films/stats/')
+        assert response.status_code == 200
+        assert response.json() == {
+            'name': 'Фильм', 'slug': 'films', 'title_count': 1,
+            'review_count': 3, 'rating': 4.0}, (
+            'Проверьте, что статистика категории возвращает число '
+            'произведений, отзывов и средний рейтинг'
+        )
+        response = client.get('/api/v1/genres/stats/')
+        assert response.status_code == 200
+        assert [(genre['slug'], genre['title_count'], genre['rating'])
+                for genre in response.json()['results']] == [
+            ('comedy', 1, 4.0), ('drama', 1, None), ('horror', 1, 4.0)]
+        assert client.get(
+            '/api/v1/genres/unknown/stats/').status_code == 404
+        assert_consistent()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_incremental_updates(self, admin_client, admin):
+        reviews, titles, user, _ = create_reviews(admin_client, admin)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        admin_client.patch(title_url, data={
+            'category': 'books', 'genre': ['comedy', 'drama']})
+        assert_consistent()
+        review = Review.objects.get(id=reviews[0]['id'])
+        review.score = 10
+        review.save()
+        assert_consistent()
+        admin_client.delete(f'{title_url}reviews/{reviews[1]["id"]}/')
+        assert_consistent()
+        admin_client.delete('/api/v1/genres/comedy/')
+        assert_consistent()
+        admin_client.delete(title_url)
+        assert_consistent()
+        assert CategoryStats.objects.get(
+            category__slug='books').title_count == 1
+        admin_client.delete(f'/api/v1/titles/{titles[1]["id"]}/')
+        assert snapshot() == (
+            [(category_id, 0, 0, 0) for category_id, *_ in snapshot()[0]],
+            [(genre_id, 0, 0, 0) for genre_id, *_ in snapshot()[1]],
+        ), 'Проверьте, что после удаления произведений статистика обнуляется'
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from reviews.importer import preserve_auto_now
+from reviews.models import Category, Genre, Review, Title
+from reviews.ratings import rebuild_trending
+
+
+def add_review(title, author, score, days_ago=0):
+    with preserve_auto_now(Review):
+        return Review.objects.create(
+            title=title, author=author, score=score, text='Отзыв',
+            pub_date=timezone.now() - timedelta(days=days_ago))
+
+
+def trending_values():
+    return dict(Title.objects.values_list('id', 'trending'))
+
+
+@pytest.fixture
+def ranked_titles(user, moderator, admin):
+    category = Category.objects.create(name='Книги', slug='books')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    titles = [Title.objects.create(name=f'Произведение {number}', year=2000)
+              for number in range(4)]
+    titles[1].category = category
+    titles[1].save()
+    titles[1].genre.add(genre)
+    add_review(titles[0], user, 10, days_ago=30)
+    add_review(titles[0], moderator, 10, days_ago=30)
+    add_review(titles[0], admin, 10, days_ago=30)
+    add_review(titles[1], user, 5)
+    add_review(titles[2], user, 5, days_ago=1)
+    add_review(titles[2], moderator, 5, days_ago=1)
+    return titles
+
+
+class Test22TitleRankings:
+
+    def ids(self, client, url, params=None):
+        response = client.get(url, params or {})
+        assert response.status_code == 200
+        return [title['id'] for title in response.json()['results']]
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_top(self, client, ranked_titles):
+        ids = [title.id for title in ranked_titles]
+        assert self.ids(client, '/api/v1/titles/top/') == [
+            ids[0], ids[1], ids[2]], (
+            'Проверьте, что /titles/top/ сортирует произведения по рейтингу '
+            'с устойчивым порядком при равенстве и без произведений без '
+            'отзывов'
+        )
+        assert self.ids(client, '/api/v1/titles/top/',
+                        {'min_reviews': 2}) == [ids[0], ids[2]]
+        assert self.ids(client, '/api/v1/titles/top/',
+                        {'category': 'books'}) == [ids[1]]
+        assert self.ids(client, '/api/v1/titles/top/',
+                        {'genre': 'drama'}) == [ids[1]]
+        response = client.get('/api/v1/titles/top/', {'min_reviews': 'x'})
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_trending(self, client, ranked_titles):
+        ids = [title.id for title in ranked_titles]
+        assert self.ids(client, '/api/v1/titles/trending/') == [
+            ids[2], ids[1], ids[0]], (
+            'Проверьте, что свежие отзывы весят больше старых'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_incremental_trending(self, ranked_titles, user):
+        review = Review.objects.get(title=ranked_titles[2], author=user)
+        review.score = 9
+        review.save()
+        Review.objects.filter(title=ranked_titles[0], author=user).delete()
+        Review.objects.get(title=ranked_titles[1]).delete()
+        incremental = trending_values()
+        rebuild_trending()
+        rebuilt = trending_values()
+        assert incremental[ranked_titles[1].id] is None
+        for title_id, value in rebuilt.items():
+            assert incremental[title_id] == pytest.approx(value), (
+                'Проверьте, что популярность, обновляемая при записи '
+                'отзывов, совпадает с пересчитанной'
+            )
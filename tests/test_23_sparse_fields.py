@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .common import create_reviews, create_titles
+
+
+def select_sql(queries, table):
+    return [query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT')
+            and f'FROM "{table}"' in query['sql']]
+
+
+class Test23SparseFieldsets:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_fields(self, client, admin_client):
+        create_titles(admin_client)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/titles/', {'fields': 'id,name'})
+        assert response.status_code == 200
+        assert [set(title) for title in response.json()['results']] == [
+            {'id', 'name'}, {'id', 'name'}], (
+            'Проверьте, что параметр fields оставляет в ответе только '
+            'перечисленные поля'
+        )
+        sql = ' '.join(select_sql(queries, 'reviews_title'))
+        assert 'description' not in sql and 'reviews_category' not in sql, (
+            'Проверьте, что ненужные столбцы и связи не загружаются из БД'
+        )
+        assert not select_sql(queries, 'reviews_genre'), (
+            'Проверьте, что жанры не подгружаются, если они не запрошены'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_titles_exclude(self, client, admin_client,
+                               django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/',
+                                  {'exclude': 'genre,description'})
+        assert set(response.json()['results'][0]) == {
+            'id', 'name', 'year', 'rating', 'category'}
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/',
+                              {'fields': 'genre'})
+        assert list(response.json()) == ['genre']
+        assert sorted(genre['slug'] for genre in response.json()['genre']) == [
+            'comedy', 'horror']
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_reviews_fields(self, client, admin_client, admin):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for pagination in ('page', 'cursor'):
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url, {'fields': 'id,score',
+                                            'pagination': pagination})
+            assert response.status_code == 200
+            assert {frozenset(review)
+                    for review in response.json()['results']} == {
+                frozenset({'id', 'score'})}
+            sql = select_sql(queries, 'reviews_review')[-1]
+            assert '"text"' not in sql, (
+                'Проверьте, что текст отзыва не загружается, если он не '
+                'запрошен'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_write_not_pruned(self, admin_client):
+        create_titles(admin_client)
+        response = admin_client.post(
+            '/api/v1/titles/?fields=id',
+            data={'name': 'Новое', 'year': 2000, 'genre': ['drama'],
+                  'category': 'books'})
+        assert response.status_code == 201
+        assert 'name' in response.json(), (
+            'Проверьте, что fields влияет только на чтение'
+        )
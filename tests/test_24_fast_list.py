@@ -0,0 +1,66 @@
+from unittest import mock
+
+import pytest
+
+from api.encoders import RowEncoder
+from reviews.models import Title
+from .common import create_reviews
+
+
+def render_both(client, settings, url, params=None, fast_expected=True):
+    contents = []
+    for enabled in (False, True):
+        settings.FAST_LIST_RENDERING = enabled
+        with mock.patch.object(RowEncoder, 'encode', autospec=True,
+                               side_effect=RowEncoder.encode) as encode:
+            response = client.get(url, params or {})
+        assert response.status_code == 200
+        assert encode.called == (enabled and fast_expected), (
+            'Проверьте, что быстрый путь включается настройкой '
+            'FAST_LIST_RENDERING'
+        )
+        contents.append(response.content)
+    return contents
+
+
+class Test24FastListRendering:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_titles_identical(self, admin_client, admin, settings):
+        create_reviews(admin_client, admin)
+        Title.objects.create(name='Без категории', year=1990)
+        for url, params in (
+                ('/api/v1/titles/', None),
+                ('/api/v1/titles/', {'genre': 'comedy'}),
+                ('/api/v1/titles/', {'category': 'books'}),
+                ('/api/v1/titles/top/', None),
+                ('/api/v1/titles/trending/', None)):
+            slow, fast = render_both(admin_client, settings, url, params)
+            assert fast == slow, (
+                'Проверьте, что быстрый путь списка произведений отдаёт '
+                f'тот же ответ байт в байт: {url} {params}'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_reviews_identical(self, admin_client, admin, settings):
+        _, titles, _, _ = create_reviews(admin_client, admin)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        for params in ({}, {'pagination': 'cursor'}):
+            slow, fast = render_both(
+                admin_client, settings, url, params)
+            assert fast == slow, (
+                'Проверьте, что быстрый путь списка отзывов отдаёт тот же '
+                f'ответ байт в байт: {params}'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_sparse_and_search_fallback(self, admin_client, admin,
+                                           settings):
+        create_reviews(admin_client, admin)
+        for params in ({'fields': 'id,name'}, {'search': 'поворот'}):
+            slow, fast = render_both(admin_client, settings,
+                                     '/api/v1/titles/', params, False)
+            assert fast == slow, (
+                'Проверьте, что при fields/exclude и поиске используется '
+                'обычный путь сериализации'
+            )
@@ -0,0 +1,126 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Genre, GenreStats, GenreTitle, Title
+from .common import create_categories
+
+
+def create_genres(count):
+    return [Genre.objects.create(name=f'Жанр {number}',
+                                 slug=f'genre-{number}')
+            for number in range(count)]
+
+
+def title_counts():
+    return dict(GenreStats.objects.values_list('genre__slug', 'title_count'))
+
+
+class Test25TitleGenreWrites:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_create_constant_queries(self, admin_client):
+        create_categories(admin_client)
+        genres = [genre.slug for genre in create_genres(10)]
+        counts = []
+        for slugs in (genres[:1], genres[:1], genres):
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.post('/api/v1/titles/', data={
+                    'name': 'Произведение', 'year': 2000, 'genre': slugs,
+                    'category': 'books'})
+            assert response.status_code == 201
+            assert sorted(response.json()['genre']) == sorted(slugs)
+            counts.append(len(queries))
+        assert counts[1] == counts[2], (
+            'Проверьте, что число запросов при создании произведения не '
+            'зависит от количества жанров'
+        )
+        assert title_counts()['genre-0'] == 3
+        assert title_counts()['genre-9'] == 1
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_unknown_slugs(self, admin_client):
+        create_categories(admin_client)
+        create_genres(2)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Произведение', 'year': 2000,
+            'genre': ['genre-0', 'missing', 'genre-1', 'absent'],
+            'category': 'books'})
+        assert response.status_code == 400
+        message = response.json()['genre'][0]
+        assert 'missing' in message and 'absent' in message, (
+            'Проверьте, что в ошибке перечислены все несуществующие slug'
+        )
+        assert 'genre-0' not in message
+        assert not Title.objects.exists()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_update_diff(self, client, admin_client):
+        create_categories(admin_client)
+        create_genres(4)
+        response = admin_client.post('/api/v1/titles/', data={
+            'name': 'Произведение', 'year': 2000,
+            'genre': ['genre-0', 'genre-1', 'genre-2'], 'category': 'books'})
+        title_id = response.json()['id']
+        kept = set(GenreTitle.objects.filter(
+            genre__slug__in=('genre-1', 'genre-2')).values_list(
+            'id', flat=True))
+        assert client.get('/api/v1/titles/').status_code == 200
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.patch(
+                f'/api/v1/titles/{title_id}/',
+                data={'genre': ['genre-1', 'genre-2', 'genre-3']})
+        assert response.status_code == 200
+        writes = [query['sql'] for query in queries.captured_queries
+                  if 'reviews_genretitle' in query['sql']
+                  and query['sql'].startswith(('INSERT', 'DELETE'))]
+        assert len(writes) == 2, (
+            'Проверьте, что связи с жанрами обновляются одной вставкой и '
+            'одним удалением'
+        )
+        assert kept <= set(GenreTitle.objects.values_list('id', flat=True)), (
+            'Проверьте, что неизменённые связи с жанрами не пересоздаются'
+        )
+        assert title_counts() == {
+            'genre-0': 0, 'genre-1': 1, 'genre-2': 1, 'genre-3': 1}
+        genres = client.get('/api/v1/titles/').json()['results'][0]['genre']
+        assert [genre['slug'] for genre in genres] == [
+            'genre-1', 'genre-2', 'genre-3'], (
+            'Проверьте, что кеш списка сбрасывается при изменении жанров'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_remove_constant_queries(self, admin_client):
+        create_categories(admin_client)
+        genres = [genre.slug for genre in create_genres(10)]
+        titles = [admin_client.post('/api/v1/titles/', data={
+            'name': f'Произведение {number}', 'year': 2000, 'genre': genres,
+            'category': 'books'}).json()['id'] for number in range(4)]
+        counts = []
+        for title_id, slugs in zip(titles[:2], (genres[1:], genres[:1])):
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.patch(f'/api/v1/titles/{title_id}/',
+                                              data={'genre': slugs})
+            assert response.status_code == 200
+            counts.append(len(queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что число запросов при удалении связей с жанрами не '
+            'зависит от их количества'
+        )
+        counts = []
+        for title_id, slugs in zip(titles[2:], (genres[1:], genres[:1])):
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.patch('/api/v1/titles/bulk/', [
+                    {'id': title_id, 'genre': slugs}], format='json')
+            assert response.status_code == 200
+            counts.append(len(queries))
+        assert counts[0] == counts[1]
+        counts = title_counts()
+        assert counts.pop('genre-0') == 2
+        assert set(counts.values()) == {2}, (
+            'Проверьте, что статистика жанров учитывает каждую удалённую '
+            'связь ровно один раз'
+        )
+        Genre.objects.get(slug='genre-5').title_set.remove(*titles)
+        assert title_counts()['genre-5'] == 0
+        assert GenreTitle.objects.count() == 18
@@ -0,0 +1,196 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, CategoryStats, GenreStats, Title
+
+
+def create_catalog(admin_client):
+    response = admin_client.post('/api/v1/categories/', [
+        {'name': 'Книги', 'slug': 'books'},
+        {'name': 'Фильмы', 'slug': 'movies'}], format='json')
+    assert response.status_code == 201
+    response = admin_client.post('/api/v1/genres/', [
+        {'name': 'Драма', 'slug': 'drama'},
+        {'name': 'Комедия', 'slug': 'comedy'},
+        {'name': 'Ужасы', 'slug': 'horror'}], format='json')
+    assert response.status_code == 201
+
+
+def make_titles(count, start=0):
+    return [{'name': f'Произведение {number}', 'year': 2000,
+             'description': f'Описание {number}', 'category': 'books',
+             'genre': ['drama', 'comedy'] if number % 2 else ['horror']}
+            for number in range(start, start + count)]
+
+
+def title_counts(stats, key):
+    return dict(stats.objects.values_list(f'{key}__slug', 'title_count'))
+
+
+class Test26BulkWrites:
+
+    @pytest.mark.django_db(transaction=True)
+    def test_01_bulk_categories_genres(self, client, admin_client):
+        assert client.get('/api/v1/genres/').json()['count'] == 0
+        create_catalog(admin_client)
+        response = client.get('/api/v1/genres/', {'search': 'ко',
+                                                  'search_mode': 'prefix'})
+        assert [genre['slug'] for genre in response.json()['results']] == [
+            'comedy'], (
+            'Проверьте, что пакетное создание заполняет поля поиска и '
+            'сбрасывает кеш списка'
+        )
+        assert CategoryStats.objects.count() == 2
+        assert GenreStats.objects.count() == 3, (
+            'Проверьте, что пакетное создание заводит строки статистики'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_02_bulk_unique_errors(self, admin_client):
+        create_catalog(admin_client)
+        response = admin_client.post('/api/v1/categories/', [
+            {'name': 'Музыка', 'slug': 'music'},
+            {'name': 'Книги снова', 'slug': 'books'},
+            {'name': 'Музыка снова', 'slug': 'music'}], format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {}
+        assert 'slug' in errors[1] and 'slug' in errors[2], (
+            'Проверьте, что ошибки уникальности возвращаются для каждого '
+            'элемента пакета'
+        )
+        assert Category.objects.count() == 2
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_bulk_titles(self, client, admin_client):
+        create_catalog(admin_client)
+        counts = []
+        for start, count in ((0, 2), (2, 2), (4, 40)):
+            with CaptureQueriesContext(connection) as queries:
+                response = admin_client.post(
+                    '/api/v1/titles/', make_titles(count, start),
+                    format='json')
+            assert response.status_code == 201
+            assert len(response.json()) == count
+            counts.append(len(queries))
+        assert counts[1] == counts[2], (
+            'Проверьте, что число запросов при пакетном создании не зависит '
+            'от размера пакета'
+        )
+        data = response.json()
+        assert data[1]['genre'] == ['drama', 'comedy']
+        assert data[1]['category'] == 'books'
+        assert len({title['id'] for title in data}) == 40
+        assert title_counts(GenreStats, 'genre') == {
+            'drama': 22, 'comedy': 22, 'horror': 22}
+        assert title_counts(CategoryStats, 'category') == {
+            'books': 44, 'movies': 0}
+        response = client.get('/api/v1/titles/', {'search': 'описание 41'})
+        assert [title['name'] for title in response.json()['results']] == [
+            'Произведение 41'], (
+            'Проверьте, что созданные пакетом произведения попадают в '
+            'поисковый индекс'
+        )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_04_bulk_abort_and_skip(self, admin_client):
+        create_catalog(admin_client)
+        payload = make_titles(3)
+        payload[1]['genre'] = ['drama', 'missing']
+        payload[2]['year'] = 3000
+        response = admin_client.post('/api/v1/titles/', payload,
+                                     format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {} and 'genre' in errors[1]
+        assert 'year' in errors[2]
+        assert not Title.objects.exists(), (
+            'Проверьте, что по умолчанию пакет с ошибками не сохраняется'
+        )
+        response = admin_client.post('/api/v1/titles/?on_error=skip',
+                                     payload, format='json')
+        assert response.status_code == 201
+        data = response.json()
+        assert [title['name'] for title in data['results']] == [
+            'Произведение 0']
+        assert [error['index'] for error in data['errors']] == [1, 2], (
+            'Проверьте, что с on_error=skip сохраняются корректные элементы, '
+            'а ошибки возвращаются по индексам'
+        )
+        response = admin_client.post('/api/v1/titles/?on_error=ignore',
+                                     payload, format='json')
+        assert response.status_code == 400
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_bulk_update(self, client, admin_client):
+        create_catalog(admin_client)
+        titles = admin_client.post('/api/v1/titles/', make_titles(3),
+                                   format='json').json()
+        response = admin_client.patch('/api/v1/titles/bulk/', [
+            {'id': titles[0]['id'], 'category': 'movies',
+             'genre': ['comedy']},
+            {'id': titles[1]['id'], 'name': 'Кентавр'}], format='json')
+        assert response.status_code == 200
+        data = response.json()
+        assert data[0]['category'] == 'movies'
+        assert data[0]['genre'] == ['comedy']
+        assert data[1]['name'] == 'Кентавр'
+        assert data[1]['genre'] == ['drama', 'comedy']
+        assert title_counts(CategoryStats, 'category') == {
+            'books': 2, 'movies': 1}
+        assert title_counts(GenreStats, 'genre') == {
+            'drama': 1, 'comedy': 2, 'horror': 1}, (
+            'Проверьте, что пакетное обновление пересчитывает статистику'
+        )
+        response = client.get('/api/v1/titles/', {'search': 'кентавр'})
+        assert [title['id'] for title in response.json()['results']] == [
+            titles[1]['id']]
+        response = admin_client.patch('/api/v1/titles/bulk/', [
+            {'id': titles[2]['id'], 'name': 'Новое'},
+            {'id': titles[2]['id'], 'name': 'Повтор'},
+            {'id': 0, 'name': 'Нет такого'}], format='json')
+        assert response.status_code == 400
+        errors = response.json()
+        assert errors[0] == {} and 'id' in errors[1] and 'id' in errors[2]
+        assert Title.objects.get(pk=titles[2]['id']).name == 'Произведение 2'
+        for method, url in (('patch', '/api/v1/titles/bulk/'),
+                            ('post', '/api/v1/titles/'),
+                            ('post', '/api/v1/genres/')):
+            response = getattr(admin_client, method)(url, [], format='json')
+            assert response.status_code == 400, (
+                'Проверьте, что пустой пакет отклоняется с ошибкой валидации'
+            )
+
+    @pytest.mark.django_db(transaction=True)
+    def test_06_bulk_permissions(self, user_client):
+        response = user_client.post('/api/v1/genres/', [
+            {'name': 'Драма', 'slug': 'drama'}], format='json')
+        assert response.status_code == 403
+        response = user_client.patch('/api/v1/titles/bulk/', [],
+                                     format='json')
+        assert response.status_code == 403
+
+    @pytest.mark.django_db(transaction=True)
+    def test_07_bulk_ids_after_delete(self, client, admin_client):
+        create_catalog(admin_client)
+        titles = admin_client.post('/api/v1/titles/', make_titles(3),
+                                   format='json').json()
+        admin_client.delete(f'/api/v1/titles/{titles[-1]["id"]}/')
+        Category.objects.filter(slug='movies').delete()
+        response = admin_client.post('/api/v1/categories/', [
+            {'name': 'Музыка', 'slug': 'music'}], format='json')
+        assert response.status_code == 201
+        assert CategoryStats.objects.filter(
+            category__slug='music').exists()
+        response = admin_client.post('/api/v1/titles/', make_titles(2, 3),
+                                     format='json')
+        assert response.status_code == 201
+        for title in response.json():
+            assert title['id'] != titles[-1]['id']
+            assert client.get(
+                f'/api/v1/titles/{title["id"]}/').json()['name'] == (
+                title['name']), (
+                'Проверьте, что пакетное создание возвращает идентификаторы, '
+                'назначенные базой данных'
+            )
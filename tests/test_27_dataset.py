@@ -0,0 +1,90 @@
+import csv
+import os
+from collections import Counter
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from .conftest import MANAGE_PATH
+
+DATA_PATH = os.path.join(MANAGE_PATH, 'static', 'data')
+SIZE = ('--users', '300', '--titles', '200', '--reviews', '3000',
+        '--comments', '500', '--categories', '4', '--genres', '8')
+
+
+def read_csv(path, filename):
+    with open(os.path.join(path, filename), encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+def generate(path, *args):
+    call_command('generate_dataset', *SIZE, '--output', str(path), *args,
+                 stdout=StringIO())
+    return {name: open(os.path.join(path, name), 'rb').read()
+            for name in sorted(os.listdir(path))}
+
+
+class Test27GenerateDataset:
+
+    def test_01_csv_reproducible(self, tmp_path):
+        first = generate(tmp_path / 'first', '--seed', '7')
+        second = generate(tmp_path / 'second', '--seed', '7')
+        other = generate(tmp_path / 'other', '--seed', '8')
+        assert first == second, (
+            'Проверьте, что при одинаковом --seed набор данных совпадает '
+            'байт в байт'
+        )
+        assert first['review.csv'] != other['review.csv']
+        assert set(first) == set(os.listdir(DATA_PATH))
+        for filename in first:
+            with open(os.path.join(DATA_PATH, filename),
+                      encoding='utf-8') as file:
+                header = next(csv.reader(file))
+            assert set(header) <= set(read_csv(
+                tmp_path / 'first', filename)[0]), (
+                f'Проверьте, что {filename} совместим с форматом fill_db'
+            )
+
+    def test_02_reviews_skewed_and_unique(self, tmp_path):
+        generate(tmp_path)
+        reviews = read_csv(tmp_path, 'review.csv')
+        assert len(reviews) == 3000
+        assert len({(row['title_id'], row['author'])
+                    for row in reviews}) == 3000, (
+            'Проверьте, что пользователь оставляет не больше одного отзыва '
+            'на произведение'
+        )
+        counts = sorted(Counter(row['title_id'] for row in reviews).values(),
+                        reverse=True)
+        assert counts[0] > 5 * counts[len(counts) // 2], (
+            'Проверьте, что популярность произведений неравномерна'
+        )
+        assert all(1 <= int(row['score']) <= 10 for row in reviews)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_03_direct_and_fill_db(self, tmp_path):
+        from reviews.models import (Comment, GenreStats, GenreTitle, Review,
+                                    Title, User)
+
+        call_command('generate_dataset', *SIZE, '--chunk-size', '700',
+                     stdout=StringIO())
+        counts = {model: model.objects.count()
+                  for model in (Title, GenreTitle, User, Review, Comment)}
+        assert counts[Review] == 3000 and counts[Comment] == 500
+        assert sum(Title.objects.values_list(
+            'rating_count', flat=True)) == 3000, (
+            'Проверьте, что после генерации пересчитаны рейтинги'
+        )
+        assert sum(GenreStats.objects.values_list(
+            'title_count', flat=True)) == counts[GenreTitle]
+        generate(tmp_path)
+        call_command('fill_db', '--path', str(tmp_path), stdout=StringIO())
+        assert {model: model.objects.count() for model in counts} == counts, (
+            'Проверьте, что CSV и прямая запись дают один и тот же набор'
+        )
+
+    def test_04_impossible_size(self):
+        with pytest.raises(CommandError):
+            call_command('generate_dataset', '--users', '2', '--titles', '2',
+                         '--reviews', '5', stdout=StringIO())
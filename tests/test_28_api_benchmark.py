@@ -0,0 +1,96 @@
+import json
+import re
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db.models import Q
+
+from reviews.models import (Category, Comment, OutgoingMail, Review, Title,
+                            User)
+
+SIZE = ('--users', '50', '--titles', '20', '--reviews', '200',
+        '--comments', '50')
+
+
+def run_benchmark(baseline, *args):
+    stdout = StringIO()
+    call_command('benchmark_api', *args, '--requests', '4',
+                 '--concurrency', '2', '--baseline', str(baseline),
+                 stdout=stdout)
+    return stdout.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28ApiBenchmark:
+
+    def test_01_all_endpoints_recorded(self, tmp_path):
+        from django.urls import resolve
+
+        from api.urls import router
+
+        baseline = tmp_path / 'baseline.json'
+        output = run_benchmark(baseline, '--seed', *SIZE)
+        assert 'Эталон не найден' in output
+        report = json.loads(baseline.read_text(encoding='utf-8'))
+        assert report['dataset']['reviews'] == 200
+        assert Title.objects.count() == 20 and Review.objects.count() == 200
+        assert not User.objects.filter(username__regex=r'^bench\d').exists()
+        assert not Comment.objects.filter(text__startswith='Замер').exists()
+        assert not Review.objects.filter(text__startswith='Замер').exists()
+        assert not Title.objects.filter(
+            Q(description__startswith='Замер')
+            | Q(description__startswith='Пакет')).exists()
+        assert not User.objects.filter(bio__startswith='Замер').exists()
+        assert not OutgoingMail.objects.filter(
+            recipient__startswith='bench').exists()
+        assert not Category.objects.filter(
+            slug__startswith='bench-').exists(), (
+            'Проверьте, что замеры удаляют созданные ими записи'
+        )
+        endpoints = report['endpoints']
+        for name, result in endpoints.items():
+            assert result['errors'] == 0, (
+                f'Проверьте, что {name} отвечает ожидаемым статусом'
+            )
+            assert result['requests'] == 4
+            assert result['p50'] <= result['p95'] <= result['p99']
+            assert result['rps'] > 0
+        assert endpoints['titles.list']['queries'] > 0
+        views = {resolve(result['path'].split('?')[0]).func
+                 for result in endpoints.values()}
+        viewsets = {view.cls for view in views if hasattr(view, 'cls')}
+        assert {viewset for _, viewset, _ in router.registry} <= viewsets
+        assert {view.__name__ for view in views} >= {
+            'send_code', 'send_token', 'query_profile'}, (
+            'Проверьте, что замеряются все адреса из api/urls.py'
+        )
+
+    def test_02_regression_reported(self, tmp_path):
+        baseline = tmp_path / 'baseline.json'
+        run_benchmark(baseline, '--seed', *SIZE, '--endpoint', 'titles.list',
+                      '--endpoint', 'titles.retrieve')
+        report = json.loads(baseline.read_text(encoding='utf-8'))
+        assert set(report['endpoints']) == {'titles.list', 'titles.retrieve'}
+        report['endpoints']['titles.list'].update(p95=0.0001, queries=0)
+        baseline.write_text(json.dumps(report), encoding='utf-8')
+        output = run_benchmark(baseline, '--endpoint', 'titles.list')
+        assert re.search(r'titles\.list: p95 0\.0001 -> ', output)
+        assert re.search(r'titles\.list: queries 0 -> \d+', output), (
+            'Проверьте, что рост числа запросов к БД считается ухудшением'
+        )
+        assert json.loads(baseline.read_text(
+            encoding='utf-8'))['endpoints']['titles.list']['queries'] == 0, (
+            'Проверьте, что без --update-baseline эталон не перезаписывается'
+        )
+        with pytest.raises(CommandError):
+            run_benchmark(baseline, '--endpoint', 'titles.list',
+                          '--fail-on-regression')
+        run_benchmark(baseline, '--endpoint', 'titles.list',
+                      '--update-baseline')
+        assert 'Ухудшений относительно эталона нет' in run_benchmark(
+            baseline, '--endpoint', 'titles.list', '--tolerance', '1000')
+
+    def test_03_empty_database(self, tmp_path):
+        with pytest.raises(CommandError):
+            run_benchmark(tmp_path / 'baseline.json')